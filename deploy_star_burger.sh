@@ -7,6 +7,9 @@ set -a &&  . ../opt/starburger/.env && set +a
 echo -e "\033[42mStart git pull\033[0m"
 cd ../opt/starburger && git pull
 
+echo -e "\033[42mSave release version\033[0m"
+printf 'GIT_REVISION=%s\nGIT_BRANCH=%s\n' "$(git rev-parse HEAD)" "$(git symbolic-ref --short -q HEAD)" > star_burger/release.env
+
 echo  -e "\033[42mStart install Python libraries\033[0m"
 source venv/bin/activate && pip install -r requirements.txt
 
@@ -19,6 +22,12 @@ echo -e "\033[42mCollect static\033[0m"
 python manage.py collectstatic --no-input
 echo -e "\033[42mMigrate database\033[0m"
 python manage.py migrate --no-input
+echo -e "\033[42mAdd default banners\033[0m"
+python manage.py add_default_banners
+echo -e "\033[42mUpdate order total prices\033[0m"
+python manage.py update_order_total_prices
+echo -e "\033[42mCreate product thumbnails\033[0m"
+python manage.py create_product_thumbnails
 
 echo -e "\033[42mRestart starburger service\033[0m"
 systemctl restart starburger.service
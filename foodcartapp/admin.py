@@ -1,18 +1,19 @@
 from django.contrib import admin
 from django.shortcuts import reverse
-from django.templatetags.static import static
 from django.utils.html import format_html
 from django.utils.encoding import iri_to_uri
 from django.utils.http import url_has_allowed_host_and_scheme
 from django.http import HttpResponseRedirect
 from django.conf import settings
 
+from .models import Banner
 from .models import Product
 from .models import ProductCategory
 from .models import Restaurant
 from .models import RestaurantMenuItem
 from .models import Order
 from .models import OrderProduct
+from .utils.thumbnails import get_thumbnail_url
 
 
 class RestaurantMenuItemInline(admin.TabularInline):
@@ -89,21 +90,21 @@ class ProductAdmin(admin.ModelAdmin):
     class Media:
         css = {
             "all": (
-                static("admin/foodcartapp.css")
+                "admin/foodcartapp.css",
             )
         }
 
     def get_image_preview(self, obj):
         if not obj.image:
             return 'выберите картинку'
-        return format_html('<img src="{url}" style="max-height: 200px;"/>', url=obj.image.url)
+        return format_html('<img src="{url}" style="max-height: 200px;"/>', url=get_thumbnail_url(obj.image, 'medium'))
     get_image_preview.short_description = 'превью'
 
     def get_image_list_preview(self, obj):
         if not obj.image or not obj.id:
             return 'нет картинки'
         edit_url = reverse('admin:foodcartapp_product_change', args=(obj.id,))
-        return format_html('<a href="{edit_url}"><img src="{src}" style="max-height: 50px;"/></a>', edit_url=edit_url, src=obj.image.url)
+        return format_html('<a href="{edit_url}"><img src="{src}" style="max-height: 50px;"/></a>', edit_url=edit_url, src=get_thumbnail_url(obj.image, 'small'))
     get_image_list_preview.short_description = 'превью'
 
 
@@ -112,6 +113,29 @@ class ProductAdmin(admin.ModelAdmin):
     pass
 
 
+@admin.register(Banner)
+class BannerAdmin(admin.ModelAdmin):
+    list_display = [
+        'get_image_list_preview',
+        'title',
+        'position',
+        'active_from',
+        'active_until',
+    ]
+    list_display_links = [
+        'title',
+    ]
+    list_editable = [
+        'position',
+    ]
+
+    def get_image_list_preview(self, obj):
+        if not obj.image:
+            return 'нет картинки'
+        return format_html('<img src="{src}" style="max-height: 50px;"/>', src=obj.image.url)
+    get_image_list_preview.short_description = 'превью'
+
+
 class OrderProductInline(admin.TabularInline):
     model = OrderProduct
     extra = 0
@@ -122,6 +146,13 @@ class OrderAdmin(admin.ModelAdmin):
     inlines = [
         OrderProductInline
     ]
+    readonly_fields = [
+        'total_price',
+    ]
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        form.instance.update_total_price()
 
     def response_change(self, request, obj):
         if 'next' not in request.GET:
@@ -143,3 +174,19 @@ class OrderProductAdmin(admin.ModelAdmin):
             obj.price = obj.product.price * obj.quantity
 
         super().save_model(request, obj, form, change)
+        obj.order.update_total_price()
+
+        if change and 'order' in form.changed_data:
+            previous_order = Order.objects.filter(id=form.initial['order']).first()
+            if previous_order:
+                previous_order.update_total_price()
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        obj.order.update_total_price()
+
+    def delete_queryset(self, request, queryset):
+        orders = list(Order.objects.filter(order_products__in=queryset).distinct())
+        super().delete_queryset(request, queryset)
+        for order in orders:
+            order.update_total_price()
@@ -0,0 +1,13 @@
+from django.db.models.fields.files import ImageField
+from django.db.models.fields.files import ImageFieldFile
+
+from .utils.uploads import get_hashed_upload_name
+
+
+class HashedImageFieldFile(ImageFieldFile):
+    def save(self, name, content, save=True):
+        super().save(get_hashed_upload_name(content, name), content, save)
+
+
+class HashedImageField(ImageField):
+    attr_class = HashedImageFieldFile
@@ -0,0 +1,47 @@
+import os
+
+from django.conf import settings
+from django.core.files import File
+from django.core.management.base import BaseCommand
+
+from foodcartapp.models import Banner
+from foodcartapp.utils.uploads import get_hashed_upload_name
+
+
+DEFAULT_BANNERS = [
+    ('Burger', 'burger.jpg', 'Tasty Burger at your door step'),
+    ('Spices', 'food.jpg', 'All Cuisines'),
+    ('New York', 'tasty.jpg', 'Food is incomplete without a tasty dessert'),
+]
+
+
+class Command(BaseCommand):
+    help = 'Добавляет баннеры по умолчанию, если в базе ещё нет ни одного баннера'
+
+    def handle(self, *args, **options):
+        if Banner.objects.exists():
+            self.stdout.write('Баннеры уже есть, ничего не добавлено')
+            return
+
+        banners_count = 0
+        for position, (title, image_name, text) in enumerate(DEFAULT_BANNERS):
+            image_path = os.path.join(settings.BASE_DIR, 'assets', image_name)
+            if not os.path.exists(image_path):
+                self.stderr.write(f'Нет картинки {image_path}, баннер «{title}» пропущен')
+                continue
+
+            banner = Banner(title=title, text=text, position=position)
+            with open(image_path, 'rb') as image_file:
+                image = File(image_file, name=image_name)
+                hashed_image_name = banner.image.field.generate_filename(
+                    banner,
+                    get_hashed_upload_name(image, image_name)
+                )
+                if banner.image.storage.exists(hashed_image_name):
+                    banner.image.name = hashed_image_name
+                else:
+                    banner.image.save(image_name, image, save=False)
+            banner.save()
+            banners_count += 1
+
+        self.stdout.write(f'Добавлено баннеров: {banners_count}')
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from foodcartapp.models import Product
+from foodcartapp.utils.thumbnails import get_thumbnails_urls
+
+
+class Command(BaseCommand):
+    help = 'Создаёт уменьшенные копии картинок товаров, которых ещё нет'
+
+    def handle(self, *args, **options):
+        image_storage = Product._meta.get_field('image').storage
+        images_names = Product.objects.exclude(image='').values_list('image', flat=True).distinct()
+
+        images_count = 0
+        failed_images_count = 0
+        for image_name in images_names.iterator():
+            images_count += 1
+            if not get_thumbnails_urls(image_storage, image_name):
+                failed_images_count += 1
+
+        self.stdout.write(f'Обработано картинок: {images_count}, с ошибками: {failed_images_count}')
@@ -0,0 +1,146 @@
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+
+STARTUP_SCRIPT = '''
+import json
+import time
+
+started_at = time.perf_counter()
+
+import django
+from django.conf import settings
+
+settings.INSTALLED_APPS
+settings_loaded_at = time.perf_counter()
+
+django.setup()
+django_set_up_at = time.perf_counter()
+
+from django.urls import get_resolver
+
+get_resolver()._populate()
+urlconf_loaded_at = time.perf_counter()
+
+print(json.dumps({
+    'settings': settings_loaded_at - started_at,
+    'django_setup': django_set_up_at - settings_loaded_at,
+    'urlconf': urlconf_loaded_at - django_set_up_at,
+    'total': urlconf_loaded_at - started_at,
+}))
+'''
+
+
+def parse_importtime(importtime_output):
+    modules_timings = {}
+    for line in importtime_output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+
+        self_us, cumulative_us, module_name = line[len('import time:'):].split('|')
+        if not self_us.strip().isdigit():
+            continue
+
+        modules_timings[module_name.strip()] = (int(self_us), int(cumulative_us))
+
+    return modules_timings
+
+
+def run_startup():
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', STARTUP_SCRIPT],
+        cwd=settings.BASE_DIR,
+        env=os.environ.copy(),
+        capture_output=True,
+        text=True,
+    )
+    if process.returncode:
+        raise CommandError(f'Не удалось запустить проект:\n{process.stderr[-2000:]}')
+
+    phases_timings = json.loads(process.stdout.strip().splitlines()[-1])
+
+    return phases_timings, parse_importtime(process.stderr)
+
+
+def build_startup_profile(runs):
+    phases_runs = defaultdict(list)
+    modules_runs = defaultdict(list)
+    for phases_timings, modules_timings in runs:
+        for phase, seconds in phases_timings.items():
+            phases_runs[phase].append(seconds * 1000)
+        for module_name, timings in modules_timings.items():
+            modules_runs[module_name].append(timings)
+
+    modules = {}
+    for module_name, timings in modules_runs.items():
+        modules[module_name] = {
+            'self_ms': round(statistics.median(self_us for self_us, _ in timings) / 1000, 3),
+            'cumulative_ms': round(statistics.median(cumulative_us for _, cumulative_us in timings) / 1000, 3),
+        }
+
+    packages = defaultdict(lambda: {'self_ms': 0, 'modules': 0})
+    for module_name, module_timings in modules.items():
+        package = packages[module_name.split('.')[0]]
+        package['self_ms'] = round(package['self_ms'] + module_timings['self_ms'], 3)
+        package['modules'] += 1
+
+    return {
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'git_revision': settings.GIT_REVISION,
+        'runs': len(runs),
+        'phases_ms': {
+            phase: round(statistics.median(milliseconds), 3)
+            for phase, milliseconds in phases_runs.items()
+        },
+        'packages': dict(sorted(packages.items())),
+        'modules': dict(sorted(modules.items())),
+    }
+
+
+class Command(BaseCommand):
+    help = 'Замеряет время запуска проекта: импорт модулей, django.setup() и загрузку URLconf'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=3, help='сколько раз запустить проект, в отчёт идут медианы')
+        parser.add_argument('--limit', type=int, default=25, help='сколько самых медленных модулей и пакетов показать')
+        parser.add_argument('--output', default='startup_profile.json', help='куда сохранить отчёт в JSON')
+
+    def handle(self, *args, **options):
+        if options['runs'] < 1:
+            raise CommandError('--runs должен быть больше нуля')
+
+        runs = [run_startup() for _ in range(options['runs'])]
+        startup_profile = build_startup_profile(runs)
+
+        with open(options['output'], 'w') as output_file:
+            json.dump(startup_profile, output_file, ensure_ascii=False, indent=2)
+            output_file.write('\n')
+
+        self.write_report(startup_profile, options['limit'])
+        self.stdout.write(f'\nОтчёт сохранён в {options["output"]}')
+
+    def write_report(self, startup_profile, limit):
+        self.stdout.write(f'Запусков: {startup_profile["runs"]}, время в мс, медиана')
+        for phase, milliseconds in startup_profile['phases_ms'].items():
+            self.stdout.write(f'{phase:>14} {milliseconds:>10.1f}')
+
+        self.stdout.write('\nПакеты по собственному времени импорта всех модулей:')
+        packages = sorted(startup_profile['packages'].items(), key=lambda item: item[1]['self_ms'], reverse=True)
+        for package_name, package in packages[:limit]:
+            self.stdout.write(f'{package["self_ms"]:>10.1f}  {package_name} ({package["modules"]} мод.)')
+
+        self.stdout.write('\nМодули по собственному времени импорта:')
+        modules = sorted(startup_profile['modules'].items(), key=lambda item: item[1]['self_ms'], reverse=True)
+        for module_name, module in modules[:limit]:
+            self.stdout.write(f'{module["self_ms"]:>10.1f} {module["cumulative_ms"]:>10.1f}  {module_name}')
@@ -0,0 +1,67 @@
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.db import transaction
+from django.db.models import F
+
+from foodcartapp.models import Order
+
+
+def iter_mismatched_orders_batches(batch_size):
+    price_quantum = Decimal(1).scaleb(-Order._meta.get_field('total_price').decimal_places)
+    mismatched_orders = Order.objects.with_calculated_total_price() \
+                                     .exclude(total_price=F('calculated_total_price')) \
+                                     .only('id', 'total_price') \
+                                     .order_by('id')
+
+    last_order_id = 0
+    while True:
+        orders = list(mismatched_orders.filter(id__gt=last_order_id)[:batch_size])
+        if not orders:
+            return
+        last_order_id = orders[-1].id
+
+        for order in orders:
+            order.calculated_total_price = Decimal(order.calculated_total_price).quantize(price_quantum)
+
+        yield [
+            order
+            for order in orders
+            if Decimal(order.total_price).quantize(price_quantum) != order.calculated_total_price
+        ]
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает сохранённую стоимость заказов по товарам в заказе'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verify', action='store_true', help='только проверить, ничего не меняя')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size должен быть больше нуля')
+
+        if options['verify']:
+            mismatched_orders_count = sum(
+                len(orders) for orders in iter_mismatched_orders_batches(options['batch_size'])
+            )
+            if mismatched_orders_count:
+                raise CommandError(f'Стоимость не совпадает у заказов: {mismatched_orders_count}')
+            self.stdout.write('Стоимость всех заказов совпадает')
+            return
+
+        updated_orders_count = 0
+        for orders in iter_mismatched_orders_batches(options['batch_size']):
+            if not orders:
+                continue
+
+            for order in orders:
+                order.total_price = order.calculated_total_price
+
+            with transaction.atomic():
+                Order.objects.bulk_update(orders, ['total_price'])
+            updated_orders_count += len(orders)
+
+        self.stdout.write(f'Обновлена стоимость заказов: {updated_orders_count}')
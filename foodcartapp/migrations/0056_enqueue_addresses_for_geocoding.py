@@ -0,0 +1,29 @@
+from django.db import migrations
+
+
+def enqueue_addresses_for_geocoding(apps, schema_editor):
+    Order = apps.get_model('foodcartapp', 'Order')
+    Restaurant = apps.get_model('foodcartapp', 'Restaurant')
+    Place = apps.get_model('geocoderapp', 'Place')
+    GeocodingTask = apps.get_model('geocoderapp', 'GeocodingTask')
+
+    addresses = set(Order.objects.filter(is_processed=False).values_list('address', flat=True))
+    addresses |= set(Restaurant.objects.values_list('address', flat=True))
+    addresses -= set(Place.objects.values_list('address', flat=True))
+
+    GeocodingTask.objects.bulk_create(
+        [GeocodingTask(address=address) for address in addresses if address],
+        ignore_conflicts=True
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('foodcartapp', '0055_alter_orderproduct_price'),
+        ('geocoderapp', '0004_geocodingtask'),
+    ]
+
+    operations = [
+        migrations.RunPython(enqueue_addresses_for_geocoding, migrations.RunPython.noop),
+    ]
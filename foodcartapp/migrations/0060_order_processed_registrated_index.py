@@ -0,0 +1,17 @@
+# Generated by Django 3.2 on 2026-10-18 01:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('foodcartapp', '0059_order_total_price'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['is_processed', 'registrated_at'], name='order_processed_registrated'),
+        ),
+    ]
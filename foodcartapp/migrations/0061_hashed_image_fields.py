@@ -0,0 +1,24 @@
+# Generated by Django 3.2 on 2026-10-18 02:09
+
+from django.db import migrations
+import foodcartapp.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('foodcartapp', '0060_order_processed_registrated_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='banner',
+            name='image',
+            field=foodcartapp.fields.HashedImageField(upload_to='banners/', verbose_name='картинка'),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='image',
+            field=foodcartapp.fields.HashedImageField(upload_to='', verbose_name='картинка'),
+        ),
+    ]
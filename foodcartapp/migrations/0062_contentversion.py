@@ -0,0 +1,25 @@
+# Generated by Django 3.2 on 2026-10-18 02:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('foodcartapp', '0061_hashed_image_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContentVersion',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True, verbose_name='содержимое')),
+                ('version', models.CharField(max_length=32, verbose_name='версия')),
+            ],
+            options={
+                'verbose_name': 'версия кэшированного содержимого',
+                'verbose_name_plural': 'версии кэшированного содержимого',
+            },
+        ),
+    ]
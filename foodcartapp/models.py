@@ -1,9 +1,15 @@
+from decimal import Decimal
+
 from django.db import models
+from django.db.models.functions import Cast
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.core.validators import MinValueValidator
 
 from phonenumber_field.modelfields import PhoneNumberField
 
+from .fields import HashedImageField
+
 
 class Restaurant(models.Model):
     name = models.CharField(
@@ -72,7 +78,7 @@ class Product(models.Model):
         decimal_places=2,
         validators=[MinValueValidator(0)]
     )
-    image = models.ImageField(
+    image = HashedImageField(
         'картинка'
     )
     special_status = models.BooleanField(
@@ -127,10 +133,19 @@ class RestaurantMenuItem(models.Model):
 
 
 class OrderQuerySet(models.QuerySet):
-    def count_price(self):
+    def with_calculated_total_price(self):
+        total_price_field = Order._meta.get_field('total_price')
         orders_with_prices = self.annotate(
-            price=models.Sum(
-                'order_products__price'
+            calculated_total_price=Cast(
+                models.Func(
+                    Coalesce(models.Sum('order_products__price'), Decimal(0), output_field=models.DecimalField()),
+                    models.Value(total_price_field.decimal_places),
+                    function='ROUND',
+                ),
+                output_field=models.DecimalField(
+                    max_digits=total_price_field.max_digits,
+                    decimal_places=total_price_field.decimal_places
+                )
             )
         )
         return orders_with_prices
@@ -209,16 +224,37 @@ class Order(models.Model):
         null=True,
         default=None
     )
+    total_price = models.DecimalField(
+        'стоимость заказа',
+        max_digits=10,
+        decimal_places=2,
+        default=0,
+        db_index=True,
+        validators=[MinValueValidator(0)]
+    )
 
     objects = OrderQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'заказ'
         verbose_name_plural = 'заказы'
+        indexes = [
+            models.Index(
+                fields=['is_processed', 'registrated_at'],
+                name='order_processed_registrated'
+            ),
+        ]
 
     def __str__(self):
         return self.address
 
+    def update_total_price(self):
+        total_price = self.order_products.aggregate(
+            total_price=models.Sum('price')
+        )['total_price']
+        self.total_price = total_price or 0
+        self.save(update_fields=['total_price'])
+
 
 class OrderProduct(models.Model):
     order = models.ForeignKey(
@@ -253,3 +289,101 @@ class OrderProduct(models.Model):
 
     def __str__(self):
         return f"{self.product.name} - {self.quantity}"
+
+
+class BannerQuerySet(models.QuerySet):
+    def active(self, moment=None):
+        moment = moment or timezone.now()
+        return self.filter(
+            models.Q(active_from__isnull=True) | models.Q(active_from__lte=moment),
+            models.Q(active_until__isnull=True) | models.Q(active_until__gt=moment),
+        )
+
+
+class Banner(models.Model):
+    title = models.CharField(
+        'заголовок',
+        max_length=50
+    )
+    text = models.CharField(
+        'текст',
+        max_length=200,
+        blank=True,
+    )
+    image = HashedImageField(
+        'картинка',
+        upload_to='banners/'
+    )
+    position = models.PositiveIntegerField(
+        'позиция',
+        default=0,
+        db_index=True
+    )
+    active_from = models.DateTimeField(
+        'показывать с',
+        blank=True,
+        null=True,
+    )
+    active_until = models.DateTimeField(
+        'показывать до',
+        blank=True,
+        null=True,
+    )
+
+    objects = BannerQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'баннер'
+        verbose_name_plural = 'баннеры'
+        ordering = ['position']
+
+    def __str__(self):
+        return self.title
+
+
+class IdempotencyKey(models.Model):
+    key = models.CharField(
+        'ключ',
+        max_length=255,
+        unique=True
+    )
+    request_hash = models.CharField(
+        'хэш запроса',
+        max_length=64
+    )
+    response_status = models.PositiveSmallIntegerField(
+        'код ответа'
+    )
+    response_body = models.TextField(
+        'тело ответа'
+    )
+    expires_at = models.DateTimeField(
+        'истекает',
+        db_index=True
+    )
+
+    class Meta:
+        verbose_name = 'ключ идемпотентности'
+        verbose_name_plural = 'ключи идемпотентности'
+
+    def __str__(self):
+        return self.key
+
+
+class ContentVersion(models.Model):
+    name = models.CharField(
+        'содержимое',
+        max_length=100,
+        unique=True
+    )
+    version = models.CharField(
+        'версия',
+        max_length=32
+    )
+
+    class Meta:
+        verbose_name = 'версия кэшированного содержимого'
+        verbose_name_plural = 'версии кэшированного содержимого'
+
+    def __str__(self):
+        return f'{self.name}: {self.version}'
@@ -0,0 +1,22 @@
+import json
+
+from django.conf import settings
+from rest_framework.parsers import BaseParser
+
+
+class NDJSONParser(BaseParser):
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+
+        for line in stream:
+            line = line.decode(encoding).strip()
+            if not line:
+                continue
+
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield line
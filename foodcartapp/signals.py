@@ -0,0 +1,49 @@
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from geocoderapp.utils.places import enqueue_addresses_for_geocoding
+
+from .models import Banner
+from .models import Order
+from .models import Product
+from .models import ProductCategory
+from .models import Restaurant
+from .models import RestaurantMenuItem
+from .utils.banners import invalidate_banners
+from .utils.catalogue import invalidate_catalogue
+from .utils.orders_notifications import notify_orders_changed
+from .utils.thumbnails import get_thumbnails_urls
+
+
+@receiver(post_save, sender=Restaurant)
+def enqueue_restaurant_address_for_geocoding(sender, instance, **kwargs):
+    enqueue_addresses_for_geocoding([instance.address])
+
+
+@receiver(post_save, sender=Product)
+def create_product_image_thumbnails(sender, instance, **kwargs):
+    image = instance.image
+    transaction.on_commit(lambda: get_thumbnails_urls(image.storage, image.name))
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=ProductCategory)
+@receiver(post_delete, sender=ProductCategory)
+@receiver(post_save, sender=RestaurantMenuItem)
+@receiver(post_delete, sender=RestaurantMenuItem)
+def invalidate_catalogue_on_change(sender, **kwargs):
+    transaction.on_commit(invalidate_catalogue)
+
+
+@receiver(post_save, sender=Banner)
+@receiver(post_delete, sender=Banner)
+def invalidate_banners_on_change(sender, **kwargs):
+    transaction.on_commit(invalidate_banners)
+
+
+@receiver(post_save, sender=Order)
+def notify_order_changed(sender, instance, **kwargs):
+    notify_orders_changed([instance.id])
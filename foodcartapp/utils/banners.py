@@ -0,0 +1,53 @@
+from django.db.models import Q
+from django.utils import timezone
+
+from foodcartapp.models import Banner
+from foodcartapp.utils.cached_content import dump_json
+from foodcartapp.utils.cached_content import get_cached_content
+from foodcartapp.utils.cached_content import invalidate_cached_content
+
+
+BANNERS_CONTENT_NAME = 'banners'
+
+
+def find_next_banners_change(now):
+    window_boundaries = [
+        boundary
+        for boundaries in Banner.objects.filter(
+            Q(active_from__gt=now) | Q(active_until__gt=now)
+        ).values_list('active_from', 'active_until')
+        for boundary in boundaries
+        if boundary and boundary > now
+    ]
+
+    return min(window_boundaries, default=None)
+
+
+def dump_banners():
+    now = timezone.now()
+    banners = Banner.objects.active(now).order_by('position', 'id')
+
+    content = dump_json([
+        {
+            'title': banner.title,
+            'src': banner.image.url,
+            'text': banner.text,
+        }
+        for banner in banners
+    ])
+
+    return content, find_next_banners_change(now)
+
+
+def get_banners():
+    return get_cached_content(BANNERS_CONTENT_NAME, dump_banners)
+
+
+def get_banners_etag(request):
+    content, etag = get_banners()
+
+    return etag
+
+
+def invalidate_banners():
+    invalidate_cached_content(BANNERS_CONTENT_NAME)
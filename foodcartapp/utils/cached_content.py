@@ -0,0 +1,75 @@
+import hashlib
+import json
+import threading
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from foodcartapp.models import ContentVersion
+
+
+CONTENT_CACHE_KEY = 'foodcartapp:{name}:{version}'
+
+local_contents_lock = threading.Lock()
+local_contents = {}
+
+
+def dump_json(content):
+    return json.dumps(
+        content,
+        cls=DjangoJSONEncoder,
+        ensure_ascii=False,
+        separators=(',', ':')
+    ).encode()
+
+
+def get_content_etag(content):
+    return hashlib.sha1(content).hexdigest()
+
+
+def get_content_version(name):
+    # versions live in the database: the geocoder worker and every web process must see the same token,
+    # which a per-process cache backend such as the default locmem can not guarantee
+    content_version, _ = ContentVersion.objects.get_or_create(name=name, defaults={'version': uuid4().hex})
+
+    return content_version.version
+
+
+def is_content_fresh(cached_content, version, now):
+    if not cached_content or cached_content['version'] != version:
+        return False
+
+    return not cached_content['expires_at'] or cached_content['expires_at'] > now
+
+
+def get_cached_content(name, build_content):
+    version = get_content_version(name)
+    now = timezone.now()
+
+    with local_contents_lock:
+        local_content = local_contents.get(name)
+        if is_content_fresh(local_content, version, now):
+            return local_content['content'], local_content['etag']
+
+    content_cache_key = CONTENT_CACHE_KEY.format(name=name, version=version)
+    cached_content = cache.get(content_cache_key)
+    if not is_content_fresh(cached_content, version, now):
+        content, expires_at = build_content()
+        cached_content = {
+            'version': version,
+            'content': content,
+            'etag': get_content_etag(content),
+            'expires_at': expires_at,
+        }
+        cache.set(content_cache_key, cached_content, timeout=None)
+
+    with local_contents_lock:
+        local_contents[name] = cached_content
+
+    return cached_content['content'], cached_content['etag']
+
+
+def invalidate_cached_content(name):
+    ContentVersion.objects.update_or_create(name=name, defaults={'version': uuid4().hex})
@@ -0,0 +1,160 @@
+from foodcartapp.models import Product
+from foodcartapp.utils.cached_content import dump_json
+from foodcartapp.utils.cached_content import get_cached_content
+from foodcartapp.utils.cached_content import get_content_etag
+from foodcartapp.utils.cached_content import invalidate_cached_content
+from foodcartapp.utils.thumbnails import get_thumbnails_urls
+
+
+CATALOGUE_CONTENT_NAME = 'catalogue'
+CATALOGUE_QUERY_PARAMS = ['fields', 'category', 'cursor', 'limit']
+PRODUCTS_PAGE_SIZE = 20
+PRODUCTS_MAX_PAGE_SIZE = 100
+
+PRODUCT_FIELDS_COLUMNS = {
+    'id': ['id'],
+    'name': ['name'],
+    'price': ['price'],
+    'special_status': ['special_status'],
+    'description': ['description'],
+    'category': ['category_id', 'category__name'],
+    'image': ['image'],
+    'thumbnails': ['image'],
+    'restaurant': ['name'],
+}
+
+
+def serialize_product(product):
+    return {
+        'id': product.id,
+        'name': product.name,
+        'price': product.price,
+        'special_status': product.special_status,
+        'description': product.description,
+        'category': {
+            'id': product.category.id,
+            'name': product.category.name,
+        } if product.category else None,
+        'image': product.image.url,
+        'thumbnails': get_thumbnails_urls(product.image.storage, product.image.name),
+        'restaurant': {
+            'id': product.id,
+            'name': product.name,
+        }
+    }
+
+
+def dump_catalogue():
+    products = Product.objects.select_related('category').available()
+
+    return dump_json([serialize_product(product) for product in products]), None
+
+
+def get_catalogue():
+    return get_cached_content(CATALOGUE_CONTENT_NAME, dump_catalogue)
+
+
+def parse_positive_int(query_params, name, max_value=None):
+    value = query_params.get(name)
+    if not value:
+        return None
+
+    try:
+        value = int(value)
+    except ValueError:
+        raise ValueError(f'{name} must be an integer')
+
+    if value < 1 or (max_value and value > max_value):
+        raise ValueError(f'{name} must be between 1 and {max_value}' if max_value else f'{name} must be positive')
+
+    return value
+
+
+def parse_catalogue_query(query_params):
+    fields = list(PRODUCT_FIELDS_COLUMNS)
+    if query_params.get('fields'):
+        fields = [field.strip() for field in query_params['fields'].split(',') if field.strip()]
+        unknown_fields = set(fields) - set(PRODUCT_FIELDS_COLUMNS)
+        if unknown_fields:
+            raise ValueError(f'unknown fields: {", ".join(sorted(unknown_fields))}')
+
+    cursor = parse_positive_int(query_params, 'cursor')
+    limit = parse_positive_int(query_params, 'limit', max_value=PRODUCTS_MAX_PAGE_SIZE)
+    if cursor and not limit:
+        limit = PRODUCTS_PAGE_SIZE
+
+    return {
+        'fields': fields,
+        'category_id': parse_positive_int(query_params, 'category'),
+        'cursor': cursor,
+        'limit': limit,
+    }
+
+
+def serialize_product_row(product_row, fields, image_storage):
+    serialized_product = {}
+    for field in fields:
+        if field == 'category':
+            serialized_product['category'] = {
+                'id': product_row['category_id'],
+                'name': product_row['category__name'],
+            } if product_row['category_id'] else None
+        elif field == 'image':
+            serialized_product['image'] = image_storage.url(product_row['image'])
+        elif field == 'thumbnails':
+            serialized_product['thumbnails'] = get_thumbnails_urls(image_storage, product_row['image'])
+        elif field == 'restaurant':
+            serialized_product['restaurant'] = {
+                'id': product_row['id'],
+                'name': product_row['name'],
+            }
+        else:
+            serialized_product[field] = product_row[field]
+
+    return serialized_product
+
+
+def dump_catalogue_page(fields, category_id=None, cursor=None, limit=None):
+    columns = {'id'}
+    for field in fields:
+        columns.update(PRODUCT_FIELDS_COLUMNS[field])
+
+    products = Product.objects.available().order_by('id')
+    if category_id:
+        products = products.filter(category_id=category_id)
+    if cursor:
+        products = products.filter(id__gt=cursor)
+    if limit:
+        products = products[:limit + 1]
+
+    product_rows = list(products.values(*columns))
+
+    next_cursor = None
+    if limit and len(product_rows) > limit:
+        product_rows = product_rows[:limit]
+        next_cursor = product_rows[-1]['id']
+
+    image_storage = Product._meta.get_field('image').storage
+    content = dump_json([
+        serialize_product_row(product_row, fields, image_storage)
+        for product_row in product_rows
+    ])
+
+    return content, next_cursor
+
+
+def is_catalogue_query(query_params):
+    return any(param in query_params for param in CATALOGUE_QUERY_PARAMS)
+
+
+def get_catalogue_etag(request):
+    content, etag = get_catalogue()
+
+    if is_catalogue_query(request.GET):
+        return get_content_etag(f'{etag}?{request.GET.urlencode()}'.encode())
+
+    return etag
+
+
+def invalidate_catalogue():
+    invalidate_cached_content(CATALOGUE_CONTENT_NAME)
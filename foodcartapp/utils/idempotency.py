@@ -0,0 +1,44 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from foodcartapp.models import IdempotencyKey
+
+
+EXPIRED_KEYS_CLEANUP_LIMIT = 100
+
+
+def get_request_hash(data):
+    canonical_data = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True, separators=(',', ':'))
+
+    return hashlib.sha256(canonical_data.encode()).hexdigest()
+
+
+def find_idempotency_key(key):
+    return IdempotencyKey.objects.filter(key=key, expires_at__gt=timezone.now()).first()
+
+
+def delete_expired_idempotency_keys(key=None, limit=EXPIRED_KEYS_CLEANUP_LIMIT):
+    expired_keys = IdempotencyKey.objects.filter(expires_at__lte=timezone.now())
+    if key:
+        expired_keys.filter(key=key).delete()
+
+    expired_keys_ids = list(expired_keys.values_list('id', flat=True)[:limit])
+    IdempotencyKey.objects.filter(id__in=expired_keys_ids).delete()
+
+
+def save_idempotency_key(key, request_hash, response_status, response_data):
+    return IdempotencyKey.objects.create(
+        key=key,
+        request_hash=request_hash,
+        response_status=response_status,
+        response_body=json.dumps(response_data, cls=DjangoJSONEncoder, ensure_ascii=False),
+        expires_at=timezone.now() + settings.IDEMPOTENCY_KEY_TTL
+    )
+
+
+def load_idempotency_key_response(idempotency_key):
+    return json.loads(idempotency_key.response_body), idempotency_key.response_status
@@ -0,0 +1,17 @@
+from django.db import connection
+
+
+ORDERS_CHANGED_CHANNEL = 'orders_changed'
+
+
+def can_notify_orders_changed():
+    return connection.vendor == 'postgresql'
+
+
+def notify_orders_changed(orders_ids):
+    if not can_notify_orders_changed():
+        return
+
+    with connection.cursor() as cursor:
+        for order_id in orders_ids:
+            cursor.execute('SELECT pg_notify(%s, %s)', [ORDERS_CHANGED_CHANNEL, str(order_id)])
@@ -0,0 +1,116 @@
+import hashlib
+import logging
+import os
+from io import BytesIO
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from PIL import Image
+from PIL import ImageOps
+from PIL import features
+
+
+logger = logging.getLogger(__name__)
+
+THUMBNAILS_DIR = 'thumbnails'
+THUMBNAIL_SIZES = {
+    'small': (200, 100),
+    'medium': (500, 500),
+}
+THUMBNAIL_FORMATS = {
+    'webp': 'WEBP',
+    'jpeg': 'JPEG',
+}
+THUMBNAIL_QUALITY = 80
+THUMBNAIL_CACHE_KEY = 'foodcartapp:thumbnail:{image_name}:{size_name}:{extension}'
+
+
+def get_thumbnail_extensions():
+    return [
+        extension
+        for extension, image_format in THUMBNAIL_FORMATS.items()
+        if image_format != 'WEBP' or features.check('webp')
+    ]
+
+
+def get_thumbnail_cache_key(image_name, size_name, extension):
+    return THUMBNAIL_CACHE_KEY.format(image_name=image_name, size_name=size_name, extension=extension)
+
+
+def get_thumbnail_name(image_name, image_hash, size_name, extension):
+    image_stem = os.path.splitext(os.path.basename(image_name))[0]
+    # uploaded images already carry the same content hash in their names
+    if image_stem.endswith(f'.{image_hash}'):
+        image_stem = image_stem[:-len(image_hash) - 1]
+
+    return f'{THUMBNAILS_DIR}/{image_stem}.{size_name}.{image_hash}.{extension}'
+
+
+def render_thumbnail(image_content, size, image_format):
+    with Image.open(BytesIO(image_content)) as image:
+        thumbnail = ImageOps.exif_transpose(image)
+        thumbnail.thumbnail(size, Image.LANCZOS)
+
+    if image_format == 'JPEG' and thumbnail.mode != 'RGB':
+        thumbnail = thumbnail.convert('RGBA')
+        background = Image.new('RGB', thumbnail.size, 'white')
+        background.paste(thumbnail, mask=thumbnail.getchannel('A'))
+        thumbnail = background
+
+    thumbnail_content = BytesIO()
+    thumbnail.save(thumbnail_content, image_format, quality=THUMBNAIL_QUALITY)
+
+    return thumbnail_content.getvalue()
+
+
+def create_thumbnails(storage, image_name):
+    with storage.open(image_name) as image_file:
+        image_content = image_file.read()
+    image_hash = hashlib.sha1(image_content).hexdigest()[:12]
+
+    thumbnails_names = {}
+    for size_name, size in THUMBNAIL_SIZES.items():
+        for extension in get_thumbnail_extensions():
+            thumbnail_name = get_thumbnail_name(image_name, image_hash, size_name, extension)
+            if not storage.exists(thumbnail_name):
+                thumbnail_content = render_thumbnail(image_content, size, THUMBNAIL_FORMATS[extension])
+                thumbnail_name = storage.save(thumbnail_name, ContentFile(thumbnail_content))
+
+            thumbnails_names[get_thumbnail_cache_key(image_name, size_name, extension)] = thumbnail_name
+
+    cache.set_many(thumbnails_names, timeout=None)
+
+    return thumbnails_names
+
+
+def get_thumbnails_urls(storage, image_name):
+    if not image_name:
+        return {}
+
+    cache_keys = {
+        (size_name, extension): get_thumbnail_cache_key(image_name, size_name, extension)
+        for size_name in THUMBNAIL_SIZES
+        for extension in get_thumbnail_extensions()
+    }
+
+    thumbnails_names = cache.get_many(cache_keys.values())
+    if len(thumbnails_names) < len(cache_keys):
+        try:
+            thumbnails_names = create_thumbnails(storage, image_name)
+        except OSError as error:
+            logger.warning('Can not create thumbnails for image %r: %s', image_name, error)
+            return {}
+
+    thumbnails_urls = {}
+    for (size_name, extension), cache_key in cache_keys.items():
+        thumbnails_urls.setdefault(size_name, {})[extension] = storage.url(thumbnails_names[cache_key])
+
+    return thumbnails_urls
+
+
+def get_thumbnail_url(image, size_name, extension='jpeg'):
+    thumbnails_urls = get_thumbnails_urls(image.storage, image.name)
+    if not thumbnails_urls:
+        return image.url
+
+    return thumbnails_urls[size_name][extension]
@@ -0,0 +1,13 @@
+import hashlib
+import os
+
+
+def get_hashed_upload_name(content, filename):
+    content_hash = hashlib.sha1()
+    for chunk in content.chunks():
+        content_hash.update(chunk)
+    content.seek(0)
+
+    stem, extension = os.path.splitext(os.path.basename(filename))
+
+    return f'{stem}.{content_hash.hexdigest()[:12]}{extension.lower()}'
@@ -1,74 +1,107 @@
 import json
+from collections import Counter
+from itertools import islice
+from types import GeneratorType
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import IntegrityError
+from django.db import connection
 from django.db import transaction
+from django.http import HttpResponse
 from django.http import JsonResponse
-from django.templatetags.static import static
+from django.utils.cache import get_conditional_response
+from django.utils.cache import patch_cache_control
+from django.utils.http import quote_etag
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
 
+from .models import IdempotencyKey
 from .models import Product
 from .models import Order
 from .models import OrderProduct
 
 from rest_framework import status
+from rest_framework.authentication import TokenAuthentication
 from rest_framework.decorators import api_view
+from rest_framework.decorators import authentication_classes
+from rest_framework.decorators import parser_classes
+from rest_framework.decorators import permission_classes
+from rest_framework.parsers import JSONParser
+from rest_framework.permissions import BasePermission
 from rest_framework.response import Response
+from rest_framework.serializers import IntegerField
 from rest_framework.serializers import ModelSerializer
+from rest_framework.serializers import ValidationError
 
 import phonenumbers
 
+from geocoderapp.utils.places import enqueue_addresses_for_geocoding
 
+from .parsers import NDJSONParser
+from .utils.banners import get_banners
+from .utils.banners import get_banners_etag
+from .utils.catalogue import dump_catalogue_page
+from .utils.catalogue import get_catalogue
+from .utils.catalogue import get_catalogue_etag
+from .utils.catalogue import is_catalogue_query
+from .utils.catalogue import parse_catalogue_query
+from .utils.idempotency import delete_expired_idempotency_keys
+from .utils.idempotency import find_idempotency_key
+from .utils.idempotency import get_request_hash
+from .utils.idempotency import load_idempotency_key_response
+from .utils.idempotency import save_idempotency_key
+from .utils.orders_notifications import notify_orders_changed
+
+
+BULK_ORDERS_BATCH_SIZE = 500
+
+
+@cache_control(public=True, no_cache=True)
+@condition(etag_func=get_banners_etag)
 def banners_list_api(request):
-    # FIXME move data to db?
-    return JsonResponse([
-        {
-            'title': 'Burger',
-            'src': static('burger.jpg'),
-            'text': 'Tasty Burger at your door step',
-        },
-        {
-            'title': 'Spices',
-            'src': static('food.jpg'),
-            'text': 'All Cuisines',
-        },
-        {
-            'title': 'New York',
-            'src': static('tasty.jpg'),
-            'text': 'Food is incomplete without a tasty dessert',
-        }
-    ], safe=False, json_dumps_params={
-        'ensure_ascii': False,
-        'indent': 4,
-    })
-
-
-def product_list_api(request):
-    products = Product.objects.select_related('category').available()
-
-    dumped_products = []
-    for product in products:
-        dumped_product = {
-            'id': product.id,
-            'name': product.name,
-            'price': product.price,
-            'special_status': product.special_status,
-            'description': product.description,
-            'category': {
-                'id': product.category.id,
-                'name': product.category.name,
-            } if product.category else None,
-            'image': product.image.url,
-            'restaurant': {
-                'id': product.id,
-                'name': product.name,
-            }
-        }
-        dumped_products.append(dumped_product)
-    return JsonResponse(dumped_products, safe=False, json_dumps_params={
-        'ensure_ascii': False,
-        'indent': 4,
-    })
+    content, etag = get_banners()
+    return HttpResponse(content, content_type='application/json')
+
+
+def render_product_list(request):
+    if not is_catalogue_query(request.GET):
+        content, etag = get_catalogue()
+        return HttpResponse(content, content_type='application/json')
+
+    try:
+        catalogue_query = parse_catalogue_query(request.GET)
+    except ValueError as error:
+        return JsonResponse({'error': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+
+    content, next_cursor = dump_catalogue_page(**catalogue_query)
+    response = HttpResponse(content, content_type='application/json')
+
+    if next_cursor:
+        next_page_params = request.GET.copy()
+        next_page_params['cursor'] = next_cursor
+        response['Link'] = f'<{request.path}?{next_page_params.urlencode()}>; rel="next"'
+
+    return response
+
+
+async def product_list_api(request):
+    etag = quote_etag(await sync_to_async(get_catalogue_etag)(request))
+
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = await sync_to_async(render_product_list)(request)
+        if request.method in ('GET', 'HEAD'):
+            response.headers.setdefault('ETag', etag)
+
+    patch_cache_control(response, public=True, no_cache=True)
+
+    return response
 
 
 class OrderProductSerializer(ModelSerializer):
+    product = IntegerField(min_value=1)
+
     class Meta:
         model = OrderProduct
         fields = ['product', 'quantity']
@@ -81,34 +114,209 @@ class OrderSerializer(ModelSerializer):
         model = Order
         fields = ['address', 'firstname', 'lastname', 'phonenumber', 'products']
 
+    def validate_products(self, products):
+        products_counts = Counter(product['product'] for product in products)
+        duplicated_products_ids = [product_id for product_id, count in products_counts.items() if count > 1]
+        if duplicated_products_ids:
+            raise ValidationError(
+                f'Товары повторяются в заказе: {", ".join(map(str, sorted(duplicated_products_ids)))}'
+            )
+
+        products_ids = set(products_counts)
+
+        available_products = self.context.get('available_products')
+        if available_products is None:
+            available_products = Product.objects.available().only('id', 'price').in_bulk(products_ids)
+
+        unavailable_products_ids = products_ids - set(available_products)
+        if unavailable_products_ids:
+            raise ValidationError(
+                f'Товары недоступны для заказа: {", ".join(map(str, sorted(unavailable_products_ids)))}'
+            )
+
+        return [
+            {**product, 'product': available_products[product['product']]}
+            for product in products
+        ]
+
+
+def build_order_products(order, products_validated):
+    return [
+        OrderProduct(
+            order=order,
+            product_id=product_validated['product'].id,
+            quantity=product_validated['quantity'],
+            price=product_validated['product'].price * product_validated['quantity']
+        )
+        for product_validated in products_validated
+    ]
+
+
+def calculate_order_total_price(products_validated):
+    return sum(
+        product_validated['product'].price * product_validated['quantity']
+        for product_validated in products_validated
+    )
+
+
+def respond_with_idempotency_key(idempotency_key, request_hash):
+    if idempotency_key.request_hash != request_hash:
+        return Response(
+            {'error': 'Ключ Idempotency-Key уже использован с другим заказом'},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+
+    content, response_status = load_idempotency_key_response(idempotency_key)
+
+    return Response(content, status=response_status)
+
 
 @api_view(['POST'])
 def register_order(request):
+    key = request.headers.get('Idempotency-Key')
+    if key:
+        if len(key) > IdempotencyKey._meta.get_field('key').max_length:
+            return Response(
+                {'error': 'Слишком длинный Idempotency-Key'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        request_hash = get_request_hash(request.data)
+        idempotency_key = find_idempotency_key(key)
+        if idempotency_key:
+            return respond_with_idempotency_key(idempotency_key, request_hash)
+
     serializer = OrderSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
 
+    try:
+        with transaction.atomic():
+            order = Order.objects.create(
+                address=serializer.validated_data['address'],
+                firstname=serializer.validated_data['firstname'],
+                lastname=serializer.validated_data['lastname'],
+                phonenumber=serializer.validated_data['phonenumber'],
+                total_price=calculate_order_total_price(serializer.validated_data['products'])
+            )
+
+            order_products = build_order_products(order, serializer.validated_data['products'])
+            OrderProduct.objects.bulk_create(order_products)
+
+            enqueue_addresses_for_geocoding([order.address])
+
+            content = serializer.data
+
+            if key:
+                delete_expired_idempotency_keys(key)
+                save_idempotency_key(key, request_hash, status.HTTP_200_OK, content)
+    except IntegrityError:
+        idempotency_key = key and find_idempotency_key(key)
+        if not idempotency_key:
+            raise
+        return respond_with_idempotency_key(idempotency_key, request_hash)
+
+    return Response(content, status=status.HTTP_200_OK)
+
+
+def find_orders_products_ids(orders_data):
+    products_ids = set()
+    for order_data in orders_data:
+        if not isinstance(order_data, dict) or not isinstance(order_data.get('products'), list):
+            continue
+
+        for product_data in order_data['products']:
+            try:
+                products_ids.add(int(product_data['product']))
+            except (KeyError, TypeError, ValueError):
+                continue
+
+    return products_ids
+
+
+def create_orders_batch(orders_data, first_order_index):
+    available_products = Product.objects.available() \
+                                        .only('id', 'price') \
+                                        .in_bulk(find_orders_products_ids(orders_data))
+
+    results = []
+    created_results = []
+    valid_serializers = []
+    for order_index, order_data in enumerate(orders_data, start=first_order_index):
+        serializer = OrderSerializer(data=order_data, context={'available_products': available_products})
+        if not serializer.is_valid():
+            results.append({'index': order_index, 'status': 'error', 'errors': serializer.errors})
+            continue
+
+        result = {'index': order_index, 'status': 'created'}
+        results.append(result)
+        created_results.append(result)
+        valid_serializers.append(serializer)
+
+    if not valid_serializers:
+        return results
+
     with transaction.atomic():
-        order = Order.objects.create(
-            address=serializer.validated_data['address'],
-            firstname=serializer.validated_data['firstname'],
-            lastname=serializer.validated_data['lastname'],
-            phonenumber=serializer.validated_data['phonenumber']
-        )
+        orders = [
+            Order(
+                address=serializer.validated_data['address'],
+                firstname=serializer.validated_data['firstname'],
+                lastname=serializer.validated_data['lastname'],
+                phonenumber=serializer.validated_data['phonenumber'],
+                total_price=calculate_order_total_price(serializer.validated_data['products'])
+            )
+            for serializer in valid_serializers
+        ]
+        if connection.features.can_return_rows_from_bulk_insert:
+            Order.objects.bulk_create(orders)
+        else:
+            for order in orders:
+                order.save()
 
         order_products = []
-        for product_validated in serializer.validated_data['products']:
-            price = product_validated['product'].price * product_validated['quantity']
-            order_product = OrderProduct(
-                order=order,
-                product=product_validated['product'],
-                quantity=product_validated['quantity'],
-                price=price
-            )
+        for order, serializer in zip(orders, valid_serializers):
+            order_products += build_order_products(order, serializer.validated_data['products'])
+        OrderProduct.objects.bulk_create(order_products, batch_size=BULK_ORDERS_BATCH_SIZE)
 
-            order_products.append(order_product)
+        enqueue_addresses_for_geocoding([order.address for order in orders])
 
-        OrderProduct.objects.bulk_create(order_products)
+        if connection.features.can_return_rows_from_bulk_insert:
+            notify_orders_changed([order.id for order in orders])
 
-    content = serializer.data
+    for result, order in zip(created_results, orders):
+        result['id'] = order.id
 
-    return Response(content, status=status.HTTP_200_OK)
+    return results
+
+
+class CanRegisterOrders(BasePermission):
+    def has_permission(self, request, view):
+        return request.user.has_perm('foodcartapp.add_order')
+
+
+@api_view(['POST'])
+@authentication_classes([TokenAuthentication])
+@permission_classes([CanRegisterOrders])
+@parser_classes([JSONParser, NDJSONParser])
+def register_orders_bulk(request):
+    orders_data = request.data
+    if not isinstance(orders_data, (list, GeneratorType)):
+        return Response(
+            {'error': 'Ожидается массив заказов или NDJSON'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    orders_data = list(islice(orders_data, settings.BULK_ORDERS_MAX_COUNT + 1))
+    if len(orders_data) > settings.BULK_ORDERS_MAX_COUNT:
+        return Response(
+            {'error': f'В одном запросе можно передать не больше {settings.BULK_ORDERS_MAX_COUNT} заказов'},
+            status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        )
+
+    results = []
+    for batch_start in range(0, len(orders_data), BULK_ORDERS_BATCH_SIZE):
+        results += create_orders_batch(
+            orders_data[batch_start:batch_start + BULK_ORDERS_BATCH_SIZE],
+            first_order_index=batch_start
+        )
+
+    return Response(results, status=status.HTTP_200_OK)
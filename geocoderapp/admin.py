@@ -1,8 +1,32 @@
 from django.contrib import admin
 
+from .models import GeocodingTask
 from .models import Place
 
 
 @admin.register(Place)
 class PlaceAdmin(admin.ModelAdmin):
-    pass
+    list_display = [
+        'address',
+        'lookup_status',
+        'refreshed_at',
+    ]
+    list_filter = [
+        'lookup_status',
+    ]
+    search_fields = [
+        'address',
+    ]
+
+
+@admin.register(GeocodingTask)
+class GeocodingTaskAdmin(admin.ModelAdmin):
+    list_display = [
+        'address',
+        'created_at',
+        'scheduled_at',
+        'attempts',
+    ]
+    search_fields = [
+        'address',
+    ]
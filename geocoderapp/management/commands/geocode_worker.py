@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from geocoderapp.utils.places import enqueue_stale_places_for_geocoding
+from geocoderapp.utils.places import process_geocoding_tasks
+
+
+class Command(BaseCommand):
+    help = 'Геокодирует адреса из очереди задач геокодирования'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50)
+        parser.add_argument('--max-attempts', type=int, default=5)
+        parser.add_argument('--retry-delay', type=int, default=60, help='секунд до повторной попытки')
+        parser.add_argument('--poll-interval', type=float, default=5, help='секунд ожидания при пустой очереди')
+        parser.add_argument(
+            '--stale-scan-interval',
+            type=float,
+            default=3600,
+            help='секунд между поисками устаревших координат ресторанов и необработанных заказов'
+        )
+        parser.add_argument('--once', action='store_true', help='разобрать очередь и завершиться')
+
+    def handle(self, *args, **options):
+        stale_scanned_at = None
+        while True:
+            now = time.monotonic()
+            if stale_scanned_at is None or now - stale_scanned_at >= options['stale_scan_interval']:
+                enqueue_stale_places_for_geocoding()
+                stale_scanned_at = now
+
+            processed_tasks_count = process_geocoding_tasks(
+                batch_size=options['batch_size'],
+                max_attempts=options['max_attempts'],
+                retry_delay=options['retry_delay']
+            )
+            if processed_tasks_count:
+                self.stdout.write(f'Обработано задач: {processed_tasks_count}')
+                continue
+
+            if options['once']:
+                return
+
+            time.sleep(options['poll_interval'])
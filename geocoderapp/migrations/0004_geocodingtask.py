@@ -0,0 +1,29 @@
+# Generated by Django 3.2 on 2026-10-18 01:26
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('geocoderapp', '0003_alter_place_refreshed_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeocodingTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('address', models.CharField(max_length=100, unique=True, verbose_name='адрес')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='поставлена в очередь')),
+                ('scheduled_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name='запланирована на')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='попыток')),
+                ('last_error', models.TextField(blank=True, verbose_name='последняя ошибка')),
+            ],
+            options={
+                'verbose_name': 'задача геокодирования',
+                'verbose_name_plural': 'задачи геокодирования',
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2 on 2026-10-18 01:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('geocoderapp', '0004_geocodingtask'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='place',
+            name='lookup_status',
+            field=models.CharField(choices=[('found', 'Найдено'), ('not_found', 'Не найдено')], db_index=True, default='found', max_length=20, verbose_name='результат геокодирования'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+from django.db import migrations
+
+
+def normalize_address(address):
+    return ' '.join(address.split()).lower()
+
+
+def normalize_model_addresses(model, ordering):
+    addresses_by_ids = {}
+    duplicated_ids = []
+    normalized_addresses = set()
+    for instance_id, address in model.objects.order_by(ordering).values_list('id', 'address').iterator():
+        normalized_address = normalize_address(address)
+        if normalized_address in normalized_addresses:
+            duplicated_ids.append(instance_id)
+            continue
+
+        normalized_addresses.add(normalized_address)
+        if address != normalized_address:
+            addresses_by_ids[instance_id] = normalized_address
+
+    model.objects.filter(id__in=duplicated_ids).delete()
+    for instance_id, normalized_address in addresses_by_ids.items():
+        model.objects.filter(id=instance_id).update(address=normalized_address)
+
+
+def normalize_places_addresses(apps, schema_editor):
+    normalize_model_addresses(apps.get_model('geocoderapp', 'Place'), '-refreshed_at')
+    normalize_model_addresses(apps.get_model('geocoderapp', 'GeocodingTask'), 'scheduled_at')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('geocoderapp', '0005_place_lookup_status'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_places_addresses, migrations.RunPython.noop),
+    ]
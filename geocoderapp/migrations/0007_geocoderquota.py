@@ -0,0 +1,25 @@
+# Generated by Django 3.2 on 2026-10-18 02:19
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('geocoderapp', '0006_normalize_addresses'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeocoderQuota',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('next_request_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='следующий запрос не раньше')),
+            ],
+            options={
+                'verbose_name': 'квота геокодера',
+                'verbose_name_plural': 'квота геокодера',
+            },
+        ),
+    ]
@@ -3,6 +3,12 @@ from django.utils import timezone
 
 
 class Place(models.Model):
+    FOUND = 'found'
+    NOT_FOUND = 'not_found'
+    LOOKUP_STATUS_CHOICES = [
+        (FOUND, 'Найдено'),
+        (NOT_FOUND, 'Не найдено'),
+    ]
     address = models.CharField(
         'адрес',
         max_length=100,
@@ -19,6 +25,13 @@ class Place(models.Model):
         null=True,
         blank=True
     )
+    lookup_status = models.CharField(
+        'результат геокодирования',
+        max_length=20,
+        choices=LOOKUP_STATUS_CHOICES,
+        default=FOUND,
+        db_index=True
+    )
     refreshed_at = models.DateTimeField(
         'обновлено',
         default=timezone.now,
@@ -31,3 +44,49 @@ class Place(models.Model):
 
     def __str__(self):
         return self.address
+
+
+class GeocodingTask(models.Model):
+    address = models.CharField(
+        'адрес',
+        max_length=100,
+        unique=True
+    )
+    created_at = models.DateTimeField(
+        'поставлена в очередь',
+        default=timezone.now
+    )
+    scheduled_at = models.DateTimeField(
+        'запланирована на',
+        default=timezone.now,
+        db_index=True
+    )
+    attempts = models.PositiveIntegerField(
+        'попыток',
+        default=0
+    )
+    last_error = models.TextField(
+        'последняя ошибка',
+        blank=True
+    )
+
+    class Meta:
+        verbose_name = 'задача геокодирования'
+        verbose_name_plural = 'задачи геокодирования'
+
+    def __str__(self):
+        return self.address
+
+
+class GeocoderQuota(models.Model):
+    next_request_at = models.DateTimeField(
+        'следующий запрос не раньше',
+        default=timezone.now
+    )
+
+    class Meta:
+        verbose_name = 'квота геокодера'
+        verbose_name_plural = 'квота геокодера'
+
+    def __str__(self):
+        return f'Квота геокодера: {self.next_request_at}'
@@ -0,0 +1,4 @@
+from django.dispatch import Signal
+
+
+places_updated = Signal()
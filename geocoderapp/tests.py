@@ -1,3 +1,153 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from urllib.parse import parse_qs
+from urllib.parse import urlparse
+
+import requests
+from django.test import SimpleTestCase
 from django.test import TestCase
+from django.test import override_settings
+
+from geocoderapp.utils.places import reserve_geocoder_requests
+from geocoderapp.utils.yandex_geocoder import RequestsSchedule
+from geocoderapp.utils.yandex_geocoder import create_session
+from geocoderapp.utils.yandex_geocoder import fetch_coordinates_batch
+
+
+STUB_PLACES = {
+    'Москва, Красная площадь, 1': '37.620795 55.753930',
+    'Москва, Тверская, 6': '37.611347 55.757896',
+}
+
+
+class StubGeocoderHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        params = parse_qs(urlparse(self.path).query)
+        address = params['geocode'][0]
+        self.server.requested_addresses.append(address)
+
+        if address == 'сломанный адрес':
+            self.send_error(500)
+            return
+        if address == 'медленный адрес':
+            time.sleep(1)
+
+        found_places = []
+        if address in STUB_PLACES:
+            found_places.append({'GeoObject': {'Point': {'pos': STUB_PLACES[address]}}})
+
+        content = json.dumps({
+            'response': {'GeoObjectCollection': {'featureMember': found_places}},
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FetchCoordinatesBatchTest(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubGeocoderHandler)
+        cls.server.requested_addresses = []
+        cls.server_thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.server_thread.start()
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_port}/1.x'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.server_thread.join()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.server.requested_addresses.clear()
+        self.session = create_session()
+        self.addCleanup(self.session.close)
+
+    def fetch_coordinates_batch(self, addresses, **kwargs):
+        return fetch_coordinates_batch(
+            'apikey',
+            addresses,
+            self.session,
+            base_url=self.base_url,
+            **kwargs
+        )
+
+    def test_batch(self):
+        coordinates, failed_addresses = self.fetch_coordinates_batch([*STUB_PLACES, 'несуществующий адрес'])
+
+        self.assertEqual(coordinates, {
+            'Москва, Красная площадь, 1': ('55.753930', '37.620795'),
+            'Москва, Тверская, 6': ('55.757896', '37.611347'),
+            'несуществующий адрес': None,
+        })
+        self.assertEqual(failed_addresses, {})
+        self.assertCountEqual(self.server.requested_addresses, [*STUB_PLACES, 'несуществующий адрес'])
+
+    def test_partial_failure(self):
+        coordinates, failed_addresses = self.fetch_coordinates_batch([*STUB_PLACES, 'сломанный адрес'])
+
+        self.assertEqual(set(coordinates), set(STUB_PLACES))
+        self.assertEqual(set(failed_addresses), {'сломанный адрес'})
+        self.assertIsInstance(failed_addresses['сломанный адрес'], requests.HTTPError)
+
+    def test_timeout(self):
+        started_at = time.monotonic()
+        coordinates, failed_addresses = self.fetch_coordinates_batch(
+            ['Москва, Тверская, 6', 'медленный адрес'],
+            timeout=0.2
+        )
+
+        self.assertLess(time.monotonic() - started_at, 1)
+        self.assertEqual(coordinates, {'Москва, Тверская, 6': ('55.757896', '37.611347')})
+        self.assertIsInstance(failed_addresses['медленный адрес'], requests.Timeout)
+
+    def test_rate_limit(self):
+        addresses = [f'адрес {number}' for number in range(6)]
+
+        started_at = time.monotonic()
+        coordinates, failed_addresses = self.fetch_coordinates_batch(
+            addresses,
+            rate_limiter=RequestsSchedule(0.1),
+            max_workers=6
+        )
+
+        self.assertGreaterEqual(time.monotonic() - started_at, 0.45)
+        self.assertEqual(set(coordinates), set(addresses))
+        self.assertEqual(failed_addresses, {})
+
+
+class RequestsScheduleTest(SimpleTestCase):
+    def test_delay_and_interval(self):
+        requests_schedule = RequestsSchedule(0.1, delay=0.2)
+
+        started_at = time.monotonic()
+        requests_schedule.acquire()
+        first_request_delay = time.monotonic() - started_at
+        requests_schedule.acquire()
+        second_request_delay = time.monotonic() - started_at
+
+        self.assertGreaterEqual(first_request_delay, 0.19)
+        self.assertLess(first_request_delay, 0.25)
+        self.assertGreaterEqual(second_request_delay, 0.29)
+
+
+@override_settings(YANDEX_GEOCODER_RATE_LIMIT=10)
+class ReserveGeocoderRequestsTest(TestCase):
+    def test_reservations_share_quota(self):
+        first_schedule = reserve_geocoder_requests(5)
+        second_schedule = reserve_geocoder_requests(1)
 
-# Create your tests here.
+        now = time.monotonic()
+        self.assertLess(first_schedule.next_request_at - now, 0.05)
+        self.assertAlmostEqual(second_schedule.next_request_at - now, 0.5, delta=0.05)
@@ -1,27 +1,65 @@
+import logging
+import threading
+from datetime import timedelta
+
 from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
 from django.utils import timezone
-from django.core.exceptions import FieldError
 
+from foodcartapp.models import Order
+from foodcartapp.models import Restaurant
+from geocoderapp.models import GeocoderQuota
+from geocoderapp.models import GeocodingTask
 from geocoderapp.models import Place
-from geocoderapp.utils.yandex_geocoder import fetch_coordinates
+from geocoderapp.signals import places_updated
+from geocoderapp.utils.yandex_geocoder import RequestsSchedule
+from geocoderapp.utils.yandex_geocoder import create_session
+from geocoderapp.utils.yandex_geocoder import fetch_coordinates_batch
 
 
-def fetch_place(address):
-    place_coordinates = fetch_coordinates(
-        settings.YANDEX_GEOCODER_TOKEN,
-        address
-    )
+logger = logging.getLogger(__name__)
 
-    if place_coordinates:
-        lat, lon = place_coordinates
-        place = Place(
-            address=address,
-            latitude=lat,
-            longitude=lon,
-            refreshed_at=timezone.now()
-        )
+geocoder_session_lock = threading.Lock()
+geocoder_session = {}
+
+
+def get_geocoder_session():
+    with geocoder_session_lock:
+        if not geocoder_session:
+            geocoder_session['session'] = create_session(
+                pool_size=settings.YANDEX_GEOCODER_MAX_WORKERS
+            )
+
+    return geocoder_session['session']
+
+
+def reserve_geocoder_requests(requests_count):
+    # the quota row is shared by the geocoder worker and the web processes,
+    # so together they never exceed YANDEX_GEOCODER_RATE_LIMIT
+    requests_interval = 1 / settings.YANDEX_GEOCODER_RATE_LIMIT
+
+    with transaction.atomic():
+        quota, _ = GeocoderQuota.objects.select_for_update().get_or_create(id=1)
+        now = timezone.now()
+        first_request_at = max(now, quota.next_request_at)
+        quota.next_request_at = first_request_at + timedelta(seconds=requests_interval * requests_count)
+        quota.save(update_fields=['next_request_at'])
+
+    return RequestsSchedule(requests_interval, delay=(first_request_at - now).total_seconds())
+
+
+def normalize_address(address):
+    return ' '.join(address.split()).lower()
 
-        return place
+
+def build_coordinates_by_addresses(places):
+    return {
+        normalize_address(place.address): (
+            (place.latitude, place.longitude) if place.lookup_status == Place.FOUND else None
+        )
+        for place in places
+    }
 
 
 def find_not_created_places_for_needed_addresses(needed_addresses):
@@ -32,14 +70,156 @@ def find_not_created_places_for_needed_addresses(needed_addresses):
     return not_created_places_addresses
 
 
-def bulk_create_places_by_addresses(place_addresses):
+def geocode_addresses(addresses, requests_schedule=None):
+    addresses = {normalize_address(address) for address in addresses}
+    if requests_schedule is None:
+        requests_schedule = reserve_geocoder_requests(len(addresses))
+
+    coordinates_by_addresses, failed_addresses = fetch_coordinates_batch(
+        settings.YANDEX_GEOCODER_TOKEN,
+        addresses,
+        get_geocoder_session(),
+        rate_limiter=requests_schedule,
+        max_workers=settings.YANDEX_GEOCODER_MAX_WORKERS,
+        timeout=settings.YANDEX_GEOCODER_TIMEOUT,
+        base_url=settings.YANDEX_GEOCODER_URL
+    )
+
+    for address, error in failed_addresses.items():
+        logger.warning('Geocoding of address %r failed: %s', address, error)
+
     places = []
-    for place_address in place_addresses:
-        place = fetch_place(place_address)
+    for place_address, place_coordinates in coordinates_by_addresses.items():
+        lat, lon = place_coordinates or (None, None)
+        places.append(
+            Place(
+                address=place_address,
+                latitude=lat,
+                longitude=lon,
+                lookup_status=Place.FOUND if place_coordinates else Place.NOT_FOUND,
+                refreshed_at=timezone.now()
+            )
+        )
+
+    return places, failed_addresses
+
+
+def save_places(places):
+    existing_places = Place.objects.in_bulk(
+        [place.address for place in places],
+        field_name='address'
+    )
+
+    places_to_create = []
+    places_to_update = []
+    for place in places:
+        existing_place = existing_places.get(place.address)
+        if existing_place:
+            place.id = existing_place.id
+            places_to_update.append(place)
+        else:
+            places_to_create.append(place)
 
-        if place:
-            places.append(place)
+    Place.objects.bulk_update(
+        places_to_update,
+        ['latitude', 'longitude', 'lookup_status', 'refreshed_at']
+    )
+    created_places = Place.objects.bulk_create(places_to_create, ignore_conflicts=True)
 
-    created_places = Place.objects.bulk_create(places)
+    if places:
+        places_updated.send(sender=Place, addresses=[place.address for place in places])
 
     return created_places
+
+
+def save_geocoded_places(places):
+    save_places(places)
+    GeocodingTask.objects.filter(address__in=[place.address for place in places]).delete()
+
+
+def enqueue_addresses_for_geocoding(addresses):
+    addresses = {normalize_address(address) for address in addresses if address}
+    not_created_places_addresses = find_not_created_places_for_needed_addresses(addresses)
+
+    GeocodingTask.objects.bulk_create(
+        [GeocodingTask(address=address) for address in not_created_places_addresses],
+        ignore_conflicts=True
+    )
+
+
+def enqueue_stale_places_for_geocoding():
+    needed_addresses = {
+        normalize_address(address)
+        for address in [
+            *Restaurant.objects.values_list('address', flat=True),
+            *Order.objects.filter(is_processed=False).values_list('address', flat=True).distinct(),
+        ]
+    }
+
+    now = timezone.now()
+    stale_places_addresses = Place.objects.filter(
+        Q(
+            lookup_status=Place.FOUND,
+            refreshed_at__lt=now - settings.GEOCODER_PLACE_TTL
+        ) | Q(
+            lookup_status=Place.NOT_FOUND,
+            refreshed_at__lt=now - settings.GEOCODER_NOT_FOUND_PLACE_TTL
+        )
+    ).values_list('address', flat=True)
+
+    GeocodingTask.objects.bulk_create(
+        [
+            GeocodingTask(address=address)
+            for address in stale_places_addresses.iterator()
+            if address in needed_addresses
+        ],
+        ignore_conflicts=True
+    )
+
+
+def take_geocoding_tasks(batch_size, lease_seconds):
+    now = timezone.now()
+
+    with transaction.atomic():
+        tasks = list(
+            GeocodingTask.objects.select_for_update(skip_locked=True)
+                                 .filter(scheduled_at__lte=now)
+                                 .order_by('scheduled_at')[:batch_size]
+        )
+        GeocodingTask.objects.filter(id__in=[task.id for task in tasks]) \
+                             .update(scheduled_at=now + timedelta(seconds=lease_seconds))
+
+    return tasks
+
+
+def process_geocoding_tasks(batch_size=50, max_attempts=5, retry_delay=60):
+    tasks = take_geocoding_tasks(batch_size, lease_seconds=retry_delay)
+    if not tasks:
+        return 0
+
+    places, failed_addresses = geocode_addresses([task.address for task in tasks])
+    save_places(places)
+
+    finished_tasks_ids = []
+    abandoned_addresses = []
+    for task in tasks:
+        if task.address not in failed_addresses:
+            finished_tasks_ids.append(task.id)
+            continue
+
+        task.attempts += 1
+        task.last_error = str(failed_addresses[task.address])
+        if task.attempts >= max_attempts:
+            logger.error('Geocoding of address %r abandoned after %s attempts', task.address, task.attempts)
+            finished_tasks_ids.append(task.id)
+            abandoned_addresses.append(task.address)
+            continue
+
+        task.scheduled_at = timezone.now() + timedelta(seconds=retry_delay * 2 ** task.attempts)
+        task.save(update_fields=['attempts', 'last_error', 'scheduled_at'])
+
+    GeocodingTask.objects.filter(id__in=finished_tasks_ids).delete()
+    # keeps the stale place out of the queue until its TTL runs out again
+    Place.objects.filter(address__in=abandoned_addresses).update(refreshed_at=timezone.now())
+
+    return len(tasks)
@@ -1,15 +1,47 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
+from requests.adapters import HTTPAdapter
+
+
+YANDEX_GEOCODER_URL = "https://geocode-maps.yandex.ru/1.x"
+
+
+class RequestsSchedule:
+    def __init__(self, interval, delay=0):
+        self.interval = interval
+        self.next_request_at = time.monotonic() + max(0, delay)
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        with self.lock:
+            request_at = self.next_request_at
+            self.next_request_at += self.interval
+
+        wait_seconds = request_at - time.monotonic()
+        if wait_seconds > 0:
+            time.sleep(wait_seconds)
+
+
+def create_session(pool_size=10):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
 
+    return session
 
-def fetch_coordinates(apikey, address):
-    base_url = "https://geocode-maps.yandex.ru/1.x"
-    response = requests.get(base_url, params={
+
+def fetch_coordinates(apikey, address, session=None, timeout=None, base_url=YANDEX_GEOCODER_URL):
+    response = (session or requests).get(base_url, params={
         "geocode": address,
         "apikey": apikey,
         "format": "json",
-    })
+    }, timeout=timeout)
     response.raise_for_status()
-    
+
     found_places = response.json()['response']['GeoObjectCollection']['featureMember']
 
     if not found_places:
@@ -19,3 +51,29 @@ def fetch_coordinates(apikey, address):
     lon, lat = most_relevant['GeoObject']['Point']['pos'].split(" ")
 
     return lat, lon
+
+
+def fetch_coordinates_batch(apikey, addresses, session, rate_limiter=None, max_workers=8,
+                            timeout=None, base_url=YANDEX_GEOCODER_URL):
+    coordinates_by_addresses = {}
+    failed_addresses = {}
+
+    def fetch_address_coordinates(address):
+        if rate_limiter:
+            rate_limiter.acquire()
+
+        try:
+            coordinates_by_addresses[address] = fetch_coordinates(
+                apikey,
+                address,
+                session=session,
+                timeout=timeout,
+                base_url=base_url
+            )
+        except (requests.RequestException, KeyError, IndexError, ValueError) as error:
+            failed_addresses[address] = error
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(fetch_address_coordinates, addresses))
+
+    return coordinates_by_addresses, failed_addresses
@@ -0,0 +1,118 @@
+import asyncio
+from http.cookies import SimpleCookie
+from importlib import import_module
+from types import SimpleNamespace
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user
+
+from restaurateur.utils.order_events import ORDERS_EVENTS_KEEPALIVE_INTERVAL
+from restaurateur.utils.order_events import ORDERS_EVENTS_POLL_INTERVAL
+from restaurateur.utils.order_events import ORDERS_EVENTS_RETRY_MILLISECONDS
+from restaurateur.utils.order_events import can_listen_orders_notifications
+from restaurateur.utils.order_events import fetch_orders_changes
+from restaurateur.utils.order_events import format_orders_events
+from restaurateur.utils.order_events import open_orders_listener
+from restaurateur.utils.order_events import parse_orders_events_cursor
+from restaurateur.utils.order_events import wait_for_orders_notifications
+
+
+ORDERS_EVENTS_PATH = '/manager/orders/events/'
+
+
+def get_scope_headers(scope):
+    return {
+        name.decode('latin1').lower(): value.decode('latin1')
+        for name, value in scope.get('headers', [])
+    }
+
+
+def get_scope_user(headers):
+    cookies = SimpleCookie(headers.get('cookie', ''))
+    session_cookie = cookies.get(settings.SESSION_COOKIE_NAME)
+
+    session_engine = import_module(settings.SESSION_ENGINE)
+    session = session_engine.SessionStore(session_cookie.value if session_cookie else None)
+
+    return get_user(SimpleNamespace(session=session))
+
+
+async def send_forbidden_response(send):
+    await send({
+        'type': 'http.response.start',
+        'status': 403,
+        'headers': [(b'content-type', b'text/plain; charset=utf-8')],
+    })
+    await send({'type': 'http.response.body', 'body': b'Forbidden'})
+
+
+async def orders_events_application(scope, receive, send):
+    headers = get_scope_headers(scope)
+
+    user = await sync_to_async(get_scope_user)(headers)
+    if not user.is_staff:  # FIXME replace with specific permission
+        await send_forbidden_response(send)
+        return
+
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [
+            (b'content-type', b'text/event-stream; charset=utf-8'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no'),
+        ],
+    })
+    await send({
+        'type': 'http.response.body',
+        'body': f'retry: {ORDERS_EVENTS_RETRY_MILLISECONDS}\n\n'.encode(),
+        'more_body': True,
+    })
+
+    disconnected = asyncio.Event()
+
+    async def watch_disconnect():
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                disconnected.set()
+                return
+
+    disconnect_watcher = asyncio.ensure_future(watch_disconnect())
+
+    listener = None
+    if await sync_to_async(can_listen_orders_notifications)():
+        listener = await sync_to_async(open_orders_listener)()
+
+    query_params = parse_qs(scope.get('query_string', b'').decode('latin1'))
+    cursor = parse_orders_events_cursor(headers.get('last-event-id'), query_params.get('cursor', [None])[0])
+    changed_orders_ids = set()
+    try:
+        while not disconnected.is_set():
+            orders_deltas, cursor = await sync_to_async(fetch_orders_changes)(cursor, changed_orders_ids)
+            await send({
+                'type': 'http.response.body',
+                'body': format_orders_events(orders_deltas, cursor),
+                'more_body': True,
+            })
+
+            if listener:
+                changed_orders_ids = await wait_for_orders_notifications(
+                    listener,
+                    ORDERS_EVENTS_KEEPALIVE_INTERVAL,
+                    disconnected
+                )
+                continue
+
+            try:
+                await asyncio.wait_for(disconnected.wait(), timeout=ORDERS_EVENTS_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        disconnect_watcher.cancel()
+        if listener:
+            listener.close()
+
+    await send({'type': 'http.response.body', 'body': b''})
@@ -0,0 +1,55 @@
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from foodcartapp.models import Order
+from foodcartapp.models import OrderProduct
+from foodcartapp.models import Restaurant
+from foodcartapp.models import RestaurantMenuItem
+from geocoderapp.models import Place
+from geocoderapp.signals import places_updated
+
+from restaurateur.utils.availability import invalidate_availability_matrix
+from restaurateur.utils.suggestions import invalidate_all_orders_restaurants
+from restaurateur.utils.suggestions import invalidate_order_restaurants
+from restaurateur.utils.suggestions import invalidate_restaurants_spatial_index
+
+
+@receiver(post_save, sender=Restaurant)
+@receiver(post_delete, sender=Restaurant)
+@receiver(post_save, sender=RestaurantMenuItem)
+@receiver(post_delete, sender=RestaurantMenuItem)
+@receiver(post_save, sender=Place)
+@receiver(post_delete, sender=Place)
+@receiver(places_updated)
+def invalidate_orders_restaurants_on_change(sender, **kwargs):
+    transaction.on_commit(invalidate_all_orders_restaurants)
+
+
+@receiver(post_save, sender=Restaurant)
+@receiver(post_delete, sender=Restaurant)
+@receiver(post_save, sender=Place)
+@receiver(post_delete, sender=Place)
+@receiver(places_updated)
+def invalidate_restaurants_spatial_index_on_change(sender, **kwargs):
+    transaction.on_commit(invalidate_restaurants_spatial_index)
+
+
+@receiver(post_save, sender=Restaurant)
+@receiver(post_delete, sender=Restaurant)
+@receiver(post_save, sender=RestaurantMenuItem)
+@receiver(post_delete, sender=RestaurantMenuItem)
+def invalidate_availability_matrix_on_change(sender, **kwargs):
+    transaction.on_commit(invalidate_availability_matrix)
+
+
+@receiver(post_save, sender=Order)
+def invalidate_order_restaurants_on_order_change(sender, instance, **kwargs):
+    transaction.on_commit(lambda: invalidate_order_restaurants(instance.id))
+
+
+@receiver(post_save, sender=OrderProduct)
+@receiver(post_delete, sender=OrderProduct)
+def invalidate_order_restaurants_on_order_product_change(sender, instance, **kwargs):
+    transaction.on_commit(lambda: invalidate_order_restaurants(instance.order_id))
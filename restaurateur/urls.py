@@ -14,6 +14,8 @@ urlpatterns = [
 
     # TODO заглушка для нереализованного функционала
     path('orders/', views.view_orders, name="view_orders"),
+    path('orders/events/', views.view_orders_events, name="orders_events"),
+    path('orders/<int:order_id>/restaurants/', views.view_order_restaurants, name="order_restaurants"),
 
     path('login/', views.LoginView.as_view(), name="login"),
     path('logout/', views.LogoutView.as_view(), name="logout"),
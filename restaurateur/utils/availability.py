@@ -0,0 +1,54 @@
+from django.core.cache import cache
+
+from foodcartapp.models import Restaurant
+from foodcartapp.models import RestaurantMenuItem
+from foodcartapp.utils.cached_content import get_content_version
+from foodcartapp.utils.cached_content import invalidate_cached_content
+
+
+AVAILABILITY_MATRIX_CONTENT_NAME = 'availability_matrix'
+AVAILABILITY_MATRIX_CACHE_KEY = 'restaurateur:availability-matrix:{version}'
+AVAILABILITY_MATRIX_CACHE_TIMEOUT = 60 * 60
+
+
+def build_availability_matrix():
+    restaurants = list(Restaurant.objects.order_by('name').values_list('id', 'name'))
+    columns_by_restaurants_ids = {
+        restaurant_id: column
+        for column, (restaurant_id, restaurant_name) in enumerate(restaurants)
+    }
+
+    rows = {}
+    available_menu_items = RestaurantMenuItem.objects.filter(availability=True) \
+                                                     .values_list('product_id', 'restaurant_id')
+    for product_id, restaurant_id in available_menu_items.iterator():
+        row = rows.get(product_id)
+        if row is None:
+            row = rows[product_id] = bytearray(len(restaurants))
+        row[columns_by_restaurants_ids[restaurant_id]] = 1
+
+    return {
+        'restaurants': restaurants,
+        'rows': {product_id: bytes(row) for product_id, row in rows.items()},
+        'empty_row': bytes(len(restaurants)),
+    }
+
+
+def get_availability_matrix():
+    version = get_content_version(AVAILABILITY_MATRIX_CONTENT_NAME)
+    cache_key = AVAILABILITY_MATRIX_CACHE_KEY.format(version=version)
+
+    availability_matrix = cache.get(cache_key)
+    if availability_matrix is None:
+        availability_matrix = build_availability_matrix()
+        cache.set(cache_key, availability_matrix, timeout=AVAILABILITY_MATRIX_CACHE_TIMEOUT)
+
+    return availability_matrix
+
+
+def get_product_availability(availability_matrix, product_id):
+    return availability_matrix['rows'].get(product_id, availability_matrix['empty_row'])
+
+
+def invalidate_availability_matrix():
+    invalidate_cached_content(AVAILABILITY_MATRIX_CONTENT_NAME)
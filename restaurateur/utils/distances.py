@@ -0,0 +1,56 @@
+import heapq
+import math
+
+from geopy import distance
+
+
+EARTH_RADIUS_KM = 6371.0088
+
+HAVERSINE_ACCURACY = 'haversine'
+GEODESIC_ACCURACY = 'geodesic'
+
+
+def calculate_haversine_distances_matrix(origins_coordinates, destinations_coordinates):
+    destinations = [
+        (math.radians(float(lat)), math.radians(float(lon)))
+        for lat, lon in destinations_coordinates
+    ]
+    destinations = [(lat, lon, math.cos(lat)) for lat, lon in destinations]
+
+    distances_matrix = []
+    for origin_lat, origin_lon in origins_coordinates:
+        origin_lat = math.radians(float(origin_lat))
+        origin_lon = math.radians(float(origin_lon))
+        origin_lat_cos = math.cos(origin_lat)
+
+        distances_row = [
+            2 * EARTH_RADIUS_KM * math.asin(math.sqrt(
+                math.sin((lat - origin_lat) / 2) ** 2
+                + origin_lat_cos * lat_cos * math.sin((lon - origin_lon) / 2) ** 2
+            ))
+            for lat, lon, lat_cos in destinations
+        ]
+        distances_matrix.append(distances_row)
+
+    return distances_matrix
+
+
+def sort_distances(origin_coordinates, distances, destinations_coordinates, accuracy=HAVERSINE_ACCURACY, top_k=3):
+    sorted_distances = sorted(distances, key=lambda item: item[1])
+
+    if accuracy == GEODESIC_ACCURACY:
+        refined_distances = [
+            (destination_id, distance.distance(origin_coordinates, destinations_coordinates[destination_id]).km)
+            for destination_id, _ in sorted_distances[:top_k]
+        ]
+        # a refined distance may exceed the haversine distance of the next candidate
+        sorted_distances = list(heapq.merge(
+            sorted(refined_distances, key=lambda item: item[1]),
+            sorted_distances[top_k:],
+            key=lambda item: item[1]
+        ))
+
+    return [
+        (destination_id, round(distance_km, 3))
+        for destination_id, distance_km in sorted_distances
+    ]
@@ -0,0 +1,125 @@
+import asyncio
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Q
+from django.urls import reverse
+from django.utils import timezone
+
+from foodcartapp.models import Order
+from foodcartapp.utils.orders_notifications import ORDERS_CHANGED_CHANNEL
+from restaurateur.utils.orders import decode_orders_cursor
+from restaurateur.utils.orders import encode_orders_cursor
+
+
+ORDERS_EVENTS_POLL_INTERVAL = 5
+ORDERS_EVENTS_KEEPALIVE_INTERVAL = 15
+ORDERS_EVENTS_RETRY_MILLISECONDS = 5000
+ORDERS_EVENTS_BATCH_SIZE = 100
+
+
+def get_initial_orders_events_cursor():
+    return f'{timezone.now().isoformat()}|0'
+
+
+def parse_orders_events_cursor(last_event_id, initial_cursor=None):
+    for cursor in [last_event_id, initial_cursor]:
+        if not cursor:
+            continue
+        try:
+            decode_orders_cursor(cursor, 'registrated_at')
+            return cursor
+        except ValueError:
+            pass
+
+    return get_initial_orders_events_cursor()
+
+
+def serialize_order_delta(order):
+    return {
+        'id': order.id,
+        'is_processed': order.is_processed,
+        'status': order.get_is_processed_display(),
+        'payment_method': order.get_payment_method_display(),
+        'total_price': order.total_price,
+        'client': f'{order.firstname} {order.lastname}',
+        'phonenumber': str(order.phonenumber),
+        'address': order.address,
+        'comment': order.comment,
+        'edit_url': reverse('admin:foodcartapp_order_change', args=(order.id,)),
+        'restaurants_url': reverse('restaurateur:order_restaurants', args=(order.id,)),
+    }
+
+
+def fetch_orders_changes(cursor, changed_orders_ids=()):
+    registrated_at, order_id = decode_orders_cursor(cursor, 'registrated_at')
+
+    new_orders = list(
+        Order.objects.filter(is_processed=False)
+                     .filter(
+                         Q(registrated_at__gt=registrated_at)
+                         | Q(registrated_at=registrated_at, id__gt=order_id)
+                     )
+                     .order_by('registrated_at', 'id')[:ORDERS_EVENTS_BATCH_SIZE]
+    )
+    if new_orders:
+        cursor = encode_orders_cursor(new_orders[-1], 'registrated_at')
+
+    changed_orders = list(
+        Order.objects.filter(id__in=changed_orders_ids)
+                     .exclude(id__in=[order.id for order in new_orders])
+    )
+
+    return [serialize_order_delta(order) for order in changed_orders + new_orders], cursor
+
+
+def format_orders_events(orders_deltas, cursor):
+    events = [
+        f'id: {cursor}\nevent: order\ndata: {json.dumps(order_delta, cls=DjangoJSONEncoder, ensure_ascii=False)}\n\n'
+        for order_delta in orders_deltas
+    ]
+    if not events:
+        events.append(f': keepalive\nid: {cursor}\n\n')
+
+    return ''.join(events).encode()
+
+
+def can_listen_orders_notifications():
+    return connections['default'].vendor == 'postgresql'
+
+
+def open_orders_listener():
+    database = connections['default']
+    listener = database.get_new_connection(database.get_connection_params())
+    listener.autocommit = True
+    with listener.cursor() as cursor:
+        cursor.execute(f'LISTEN {ORDERS_CHANGED_CHANNEL}')
+
+    return listener
+
+
+def read_orders_notifications(listener):
+    listener.poll()
+    changed_orders_ids = {int(notification.payload) for notification in listener.notifies}
+    listener.notifies.clear()
+
+    return changed_orders_ids
+
+
+async def wait_for_orders_notifications(listener, timeout, disconnected):
+    loop = asyncio.get_running_loop()
+    readable = asyncio.Event()
+    waiters = [asyncio.ensure_future(readable.wait()), asyncio.ensure_future(disconnected.wait())]
+    loop.add_reader(listener.fileno(), readable.set)
+    try:
+        await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        loop.remove_reader(listener.fileno())
+        for waiter in waiters:
+            waiter.cancel()
+
+    if not readable.is_set():
+        return set()
+
+    return read_orders_notifications(listener)
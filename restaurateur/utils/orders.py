@@ -0,0 +1,85 @@
+from datetime import datetime
+from datetime import time
+from datetime import timedelta
+from decimal import Decimal
+from decimal import InvalidOperation
+
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+
+ORDERS_PAGE_SIZE = 50
+
+ORDERS_ORDERING_FIELDS = {
+    'registrated_at': parse_datetime,
+    'total_price': Decimal,
+}
+
+
+def get_day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def filter_orders(orders, payment_method=None, registrated_from=None, registrated_to=None, has_restaurant=None):
+    if payment_method:
+        orders = orders.filter(payment_method=payment_method)
+    if registrated_from:
+        orders = orders.filter(registrated_at__gte=get_day_start(registrated_from))
+    if registrated_to:
+        orders = orders.filter(registrated_at__lt=get_day_start(registrated_to + timedelta(days=1)))
+    if has_restaurant is not None:
+        orders = orders.filter(restaurant__isnull=not has_restaurant)
+
+    return orders
+
+
+def encode_orders_cursor(order, ordering):
+    field = ordering.lstrip('-')
+    value = getattr(order, field)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+
+    return f'{value}|{order.id}'
+
+
+def decode_orders_cursor(cursor, ordering):
+    field = ordering.lstrip('-')
+    try:
+        value, order_id = cursor.rsplit('|', 1)
+        value = ORDERS_ORDERING_FIELDS[field](value)
+        order_id = int(order_id)
+    except (KeyError, ValueError, InvalidOperation):
+        raise ValueError(f'Invalid orders cursor: {cursor}')
+
+    if value is None:
+        raise ValueError(f'Invalid orders cursor: {cursor}')
+
+    return value, order_id
+
+
+def paginate_orders(orders, ordering, cursor=None, page_size=ORDERS_PAGE_SIZE):
+    field = ordering.lstrip('-')
+    descending = ordering.startswith('-')
+
+    if descending:
+        orders = orders.order_by(f'-{field}', '-id')
+    else:
+        orders = orders.order_by(field, 'id')
+
+    if cursor:
+        value, order_id = decode_orders_cursor(cursor, ordering)
+        comparison = 'lt' if descending else 'gt'
+        orders = orders.filter(
+            Q(**{f'{field}__{comparison}': value})
+            | Q(**{field: value, f'id__{comparison}': order_id})
+        )
+
+    page_orders = list(orders[:page_size + 1])
+
+    next_cursor = None
+    if len(page_orders) > page_size:
+        page_orders = page_orders[:page_size]
+        next_cursor = encode_orders_cursor(page_orders[-1], ordering)
+
+    return page_orders, next_cursor
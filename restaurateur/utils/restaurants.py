@@ -1,72 +1,66 @@
-import copy
+from collections import defaultdict
 
-from geopy import distance
+from geocoderapp.utils.places import normalize_address
+from restaurateur.utils.distances import HAVERSINE_ACCURACY
+from restaurateur.utils.distances import sort_distances
 
 
-def add_distance_to_restaurant(restaurants, order_coordinates, places):
-    restaurants_with_distances = []
+def build_restaurants_index_by_products(restaurant_menu_items):
+    restaurants_ids_by_products = defaultdict(set)
+    for product_id, restaurant_id in restaurant_menu_items.values_list('product_id', 'restaurant_id'):
+        restaurants_ids_by_products[product_id].add(restaurant_id)
 
-    for restaurant in restaurants:
-        place = list(
-            filter(
-                lambda place: place.address == restaurant.address,
-                places
-            )
-        )[0]
-        restaurant_coordinates = (place.latitude, place.longitude)
+    return {
+        product_id: frozenset(restaurants_ids)
+        for product_id, restaurants_ids in restaurants_ids_by_products.items()
+    }
 
-        restaurant.distance_to_order_address = round(
-            distance.distance(restaurant_coordinates, order_coordinates).km, 3
-        )
-
-        restaurant_copy = copy.copy(restaurant)
 
-        restaurants_with_distances.append(restaurant_copy)
+def find_restaurants_that_can_prepare_order(order, restaurants_by_products):
+    products_ids = {order_product.product_id for order_product in order.order_products.all()}
+    if not products_ids:
+        return frozenset()
 
-    sorted_restaurants_with_distances = sorted(
-        restaurants_with_distances,
-        key=lambda restaurant: restaurant.distance_to_order_address
+    restaurants_ids_by_products = sorted(
+        (restaurants_by_products.get(product_id, frozenset()) for product_id in products_ids),
+        key=len
     )
 
-    return sorted_restaurants_with_distances
-
-
-def find_restaurants_that_can_prepare_order(order, restaurant_menu_items):
-    restaurants_that_can_prepare_order_by_products = []
-    for order_product in order.order_products.all():
-        restaurants_with_required_product_in_menu = [restaurant_menu_item.restaurant for restaurant_menu_item in restaurant_menu_items if restaurant_menu_item.product==order_product.product]
-        restaurants_that_can_prepare_order_by_products.append(restaurants_with_required_product_in_menu)
-
-    restaurants_that_can_prepare_order = set.intersection(*map(set, restaurants_that_can_prepare_order_by_products))
-
-    return restaurants_that_can_prepare_order
+    return frozenset.intersection(*restaurants_ids_by_products)
 
 
-def append_restaurants_with_distance_to_order(order, places, restaurant_menu_items):
-    try:
-        place = list(
-            filter(
-                lambda place: place.address == order.address,
-                places
-            )
-        )[0]
+def append_restaurants_with_distance_to_orders(orders, coordinates_by_addresses, restaurants_by_products,
+                                                restaurants, restaurants_index, accuracy=HAVERSINE_ACCURACY,
+                                                top_k=3, limit=None, radius_km=None):
+    for order in orders:
+        order_address = normalize_address(order.address)
+        order.coordinates = coordinates_by_addresses.get(order_address)
+        if not order.coordinates:
+            order.restaurants_distances = []
+            order.restaurants = 'coordinates_error' if order_address in coordinates_by_addresses else 'coordinates_pending'
+            continue
 
-        order.coordinates = (place.latitude, place.longitude)
-
-        restaurants_that_can_prepare_order = find_restaurants_that_can_prepare_order(
+        restaurants_ids_that_can_prepare_order = find_restaurants_that_can_prepare_order(
             order,
-            restaurant_menu_items
+            restaurants_by_products
         )
-
-        restaurants_with_distance = add_distance_to_restaurant(
-            restaurants_that_can_prepare_order,
+        restaurants_distances = restaurants_index.find_nearest(
             order.coordinates,
-            places
+            top_k=limit,
+            radius_km=radius_km,
+            points_ids=restaurants_ids_that_can_prepare_order & restaurants.keys()
         )
 
-        order.restaurants = restaurants_with_distance
-
-    except IndexError:
-        order.restaurants = 'coordinates_error'
+        order.restaurants_distances = sort_distances(
+            order.coordinates,
+            restaurants_distances,
+            restaurants_index.coordinates,
+            accuracy=accuracy,
+            top_k=top_k
+        )
+        order.restaurants = [
+            (restaurants[restaurant_id], distance_km)
+            for restaurant_id, distance_km in order.restaurants_distances
+        ]
 
-    return order
+    return orders
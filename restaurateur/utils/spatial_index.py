@@ -0,0 +1,98 @@
+import math
+from collections import defaultdict
+
+from restaurateur.utils.distances import EARTH_RADIUS_KM
+from restaurateur.utils.distances import calculate_haversine_distances_matrix
+
+
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+GRID_CELL_SIZE_KM = 5
+
+
+class GeoGridIndex:
+    def __init__(self, points_coordinates, cell_size_km=GRID_CELL_SIZE_KM):
+        self.cell_size_km = cell_size_km
+        self.cell_size_degrees = cell_size_km / KM_PER_DEGREE
+        self.coordinates = {}
+        self.cells = defaultdict(list)
+
+        for point_id, (lat, lon) in points_coordinates.items():
+            lat, lon = float(lat), float(lon)
+            self.coordinates[point_id] = (lat, lon)
+            self.cells[self.get_cell(lat, lon)].append(point_id)
+
+        self.cells = dict(self.cells)
+        self.cells_bounds = (
+            min(cell_lat for cell_lat, cell_lon in self.cells),
+            max(cell_lat for cell_lat, cell_lon in self.cells),
+            min(cell_lon for cell_lat, cell_lon in self.cells),
+            max(cell_lon for cell_lat, cell_lon in self.cells),
+        ) if self.cells else None
+
+    def get_cell(self, lat, lon):
+        return math.floor(lat / self.cell_size_degrees), math.floor(lon / self.cell_size_degrees)
+
+    def get_max_ring(self, origin_cell):
+        if not self.cells_bounds:
+            return -1
+
+        origin_cell_lat, origin_cell_lon = origin_cell
+        min_cell_lat, max_cell_lat, min_cell_lon, max_cell_lon = self.cells_bounds
+        return max(
+            origin_cell_lat - min_cell_lat,
+            max_cell_lat - origin_cell_lat,
+            origin_cell_lon - min_cell_lon,
+            max_cell_lon - origin_cell_lon,
+        )
+
+    def get_ring_cells(self, origin_cell, ring):
+        origin_cell_lat, origin_cell_lon = origin_cell
+        if not ring:
+            return [origin_cell]
+
+        ring_cells = []
+        for cell_lat_offset in range(-ring, ring + 1):
+            cell_lon_offsets = (-ring, ring) if abs(cell_lat_offset) < ring else range(-ring, ring + 1)
+            for cell_lon_offset in cell_lon_offsets:
+                ring_cells.append((origin_cell_lat + cell_lat_offset, origin_cell_lon + cell_lon_offset))
+
+        return ring_cells
+
+    def get_covered_radius_km(self, origin_lat, ring):
+        farthest_lat = min(90, abs(origin_lat) + (ring + 1) * self.cell_size_degrees)
+        return ring * self.cell_size_km * math.cos(math.radians(farthest_lat))
+
+    def find_nearest(self, origin_coordinates, top_k=None, radius_km=None, points_ids=None):
+        origin_lat, origin_lon = float(origin_coordinates[0]), float(origin_coordinates[1])
+        origin_cell = self.get_cell(origin_lat, origin_lon)
+
+        nearest_points = []
+        for ring in range(self.get_max_ring(origin_cell) + 1):
+            ring_points_ids = [
+                point_id
+                for cell in self.get_ring_cells(origin_cell, ring)
+                for point_id in self.cells.get(cell, ())
+                if points_ids is None or point_id in points_ids
+            ]
+            if ring_points_ids:
+                [distances_row] = calculate_haversine_distances_matrix(
+                    [(origin_lat, origin_lon)],
+                    [self.coordinates[point_id] for point_id in ring_points_ids]
+                )
+                nearest_points.extend(
+                    (point_id, distance_km)
+                    for point_id, distance_km in zip(ring_points_ids, distances_row)
+                    if radius_km is None or distance_km <= radius_km
+                )
+                nearest_points.sort(key=lambda item: item[1])
+                if top_k:
+                    del nearest_points[top_k:]
+
+            covered_radius_km = self.get_covered_radius_km(origin_lat, ring)
+            if radius_km is not None and covered_radius_km >= radius_km:
+                break
+            if top_k and len(nearest_points) == top_k and nearest_points[-1][1] <= covered_radius_km:
+                break
+
+        return nearest_points
@@ -0,0 +1,174 @@
+import threading
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+from foodcartapp.models import Order
+from foodcartapp.models import Restaurant
+from foodcartapp.models import RestaurantMenuItem
+from foodcartapp.utils.cached_content import get_content_version
+from foodcartapp.utils.cached_content import invalidate_cached_content
+from geocoderapp.models import Place
+from geocoderapp.utils.places import build_coordinates_by_addresses
+from geocoderapp.utils.places import geocode_addresses
+from geocoderapp.utils.places import normalize_address
+from geocoderapp.utils.places import reserve_geocoder_requests
+from geocoderapp.utils.places import save_geocoded_places
+from restaurateur.utils.restaurants import append_restaurants_with_distance_to_orders
+from restaurateur.utils.restaurants import build_restaurants_index_by_products
+from restaurateur.utils.spatial_index import GeoGridIndex
+
+
+ORDER_RESTAURANTS_CONTENT_NAME = 'order_restaurants'
+ORDER_RESTAURANTS_CACHE_KEY = 'restaurateur:order-restaurants:{version}:{order_id}'
+ORDER_RESTAURANTS_CACHE_TIMEOUT = 60 * 60
+
+RESTAURANTS_SPATIAL_INDEX_CONTENT_NAME = 'restaurants_spatial_index'
+
+restaurants_spatial_index_lock = threading.Lock()
+restaurants_spatial_index = {}
+
+
+def get_order_restaurants_cache_key(order_id):
+    version = get_content_version(ORDER_RESTAURANTS_CONTENT_NAME)
+
+    return ORDER_RESTAURANTS_CACHE_KEY.format(version=version, order_id=order_id)
+
+
+def build_restaurants_spatial_index():
+    restaurants_addresses = dict(Restaurant.objects.values_list('id', 'address'))
+    coordinates_by_addresses = build_coordinates_by_addresses(
+        Place.objects.filter(address__in=[normalize_address(address) for address in restaurants_addresses.values()])
+    )
+
+    restaurants_coordinates = {}
+    for restaurant_id, restaurant_address in restaurants_addresses.items():
+        restaurant_coordinates = coordinates_by_addresses.get(normalize_address(restaurant_address))
+        if restaurant_coordinates:
+            restaurants_coordinates[restaurant_id] = restaurant_coordinates
+
+    return GeoGridIndex(restaurants_coordinates)
+
+
+def get_restaurants_spatial_index():
+    version = get_content_version(RESTAURANTS_SPATIAL_INDEX_CONTENT_NAME)
+
+    with restaurants_spatial_index_lock:
+        if restaurants_spatial_index.get('version') == version:
+            return restaurants_spatial_index['index']
+
+    index = build_restaurants_spatial_index()
+
+    with restaurants_spatial_index_lock:
+        restaurants_spatial_index.update(version=version, index=index)
+
+    return index
+
+
+def rank_order_restaurants(order):
+    restaurant_menu_items = RestaurantMenuItem.objects.filter(
+        availability=True,
+        product_id__in=[order_product.product_id for order_product in order.order_products.all()]
+    )
+    restaurants_by_products = build_restaurants_index_by_products(restaurant_menu_items)
+    restaurants = Restaurant.objects.filter(
+        id__in=restaurant_menu_items.values('restaurant_id')
+    ).in_bulk()
+
+    coordinates_by_addresses = build_coordinates_by_addresses(
+        Place.objects.filter(address=normalize_address(order.address))
+    )
+
+    append_restaurants_with_distance_to_orders(
+        [order],
+        coordinates_by_addresses,
+        restaurants_by_products,
+        restaurants,
+        get_restaurants_spatial_index(),
+        accuracy=settings.DISTANCE_ACCURACY,
+        top_k=settings.GEODESIC_TOP_K,
+        limit=settings.ORDER_RESTAURANTS_LIMIT,
+        radius_km=settings.ORDER_RESTAURANTS_RADIUS_KM
+    )
+
+    if isinstance(order.restaurants, str):
+        return {'status': order.restaurants, 'restaurants': []}
+
+    return {
+        'status': 'ok',
+        'restaurants': [
+            {
+                'id': restaurant.id,
+                'name': restaurant.name,
+                'distance_km': distance_km,
+            }
+            for restaurant, distance_km in order.restaurants
+        ],
+    }
+
+
+def get_order_restaurants(order_id):
+    cache_key = get_order_restaurants_cache_key(order_id)
+
+    order_restaurants = cache.get(cache_key)
+    if order_restaurants is not None:
+        return order_restaurants
+
+    order = Order.objects.prefetch_related('order_products').filter(id=order_id).first()
+    if not order:
+        return None
+
+    order_restaurants = rank_order_restaurants(order)
+    cache.set(cache_key, order_restaurants, timeout=ORDER_RESTAURANTS_CACHE_TIMEOUT)
+
+    return order_restaurants
+
+
+def get_order_address(order_id):
+    return Order.objects.filter(id=order_id).values_list('address', flat=True).first()
+
+
+def is_address_geocoded(address):
+    return Place.objects.filter(address=normalize_address(address)).exists()
+
+
+async def geocode_order_address(order_id):
+    order_address = await sync_to_async(get_order_address)(order_id)
+    if not order_address:
+        return
+
+    if await sync_to_async(is_address_geocoded)(order_address):
+        # the worker has already geocoded the address, only the cached suggestions are outdated
+        await sync_to_async(invalidate_order_restaurants)(order_id)
+        return
+
+    requests_schedule = await sync_to_async(reserve_geocoder_requests)(1)
+    places, failed_addresses = await sync_to_async(geocode_addresses, thread_sensitive=False)(
+        [order_address],
+        requests_schedule
+    )
+    if places:
+        await sync_to_async(save_geocoded_places)(places)
+
+
+async def get_order_restaurants_async(order_id):
+    order_restaurants = await sync_to_async(get_order_restaurants)(order_id)
+
+    if order_restaurants and order_restaurants['status'] == 'coordinates_pending':
+        await geocode_order_address(order_id)
+        order_restaurants = await sync_to_async(get_order_restaurants)(order_id)
+
+    return order_restaurants
+
+
+def invalidate_order_restaurants(order_id):
+    cache.delete(get_order_restaurants_cache_key(order_id))
+
+
+def invalidate_all_orders_restaurants():
+    invalidate_cached_content(ORDER_RESTAURANTS_CONTENT_NAME)
+
+
+def invalidate_restaurants_spatial_index():
+    invalidate_cached_content(RESTAURANTS_SPATIAL_INDEX_CONTENT_NAME)
@@ -1,22 +1,42 @@
+from asgiref.sync import sync_to_async
 from django import forms
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404
+from django.http import HttpResponse
+from django.http import JsonResponse
+from django.http import StreamingHttpResponse
 from django.shortcuts import redirect, render
+from django.template.loader import get_template
+from django.template.loader import render_to_string
 from django.views import View
+from django.urls import reverse
 from django.urls import reverse_lazy
+from django.utils.http import urlencode
 from django.contrib.auth.decorators import user_passes_test
+from django.contrib.auth.views import redirect_to_login
 
 from django.contrib.auth import authenticate, login
 from django.contrib.auth import views as auth_views
 
 from foodcartapp.models import Product
 from foodcartapp.models import Restaurant
-from foodcartapp.models import RestaurantMenuItem
 from foodcartapp.models import Order
+from foodcartapp.utils.thumbnails import get_thumbnail_url
 
-from restaurateur.utils.restaurants import append_restaurants_with_distance_to_order
+from restaurateur.utils.availability import get_availability_matrix
+from restaurateur.utils.availability import get_product_availability
+from restaurateur.utils.order_events import ORDERS_EVENTS_RETRY_MILLISECONDS
+from restaurateur.utils.order_events import fetch_orders_changes
+from restaurateur.utils.order_events import format_orders_events
+from restaurateur.utils.order_events import get_initial_orders_events_cursor
+from restaurateur.utils.order_events import parse_orders_events_cursor
+from restaurateur.utils.orders import filter_orders
+from restaurateur.utils.orders import paginate_orders
+from restaurateur.utils.suggestions import get_order_restaurants_async
 
-from geocoderapp.models import Place
-from geocoderapp.utils.places import find_not_created_places_for_needed_addresses
-from geocoderapp.utils.places import bulk_create_places_by_addresses
+
+PRODUCTS_ROWS_PLACEHOLDER = '<!-- products rows -->'
+PRODUCTS_ROWS_CHUNK_SIZE = 50
 
 
 class Login(forms.Form):
@@ -36,6 +56,50 @@ class Login(forms.Form):
     )
 
 
+class OrdersFilter(forms.Form):
+    ORDERING_CHOICES = [
+        ('registrated_at', 'Сначала старые'),
+        ('-registrated_at', 'Сначала новые'),
+        ('-total_price', 'Сначала дорогие'),
+        ('total_price', 'Сначала дешёвые'),
+    ]
+    HAS_RESTAURANT_CHOICES = [
+        ('', 'Все'),
+        ('yes', 'Ресторан назначен'),
+        ('no', 'Ресторан не назначен'),
+    ]
+
+    payment_method = forms.ChoiceField(
+        label='Способ оплаты', required=False,
+        choices=[('', 'Любой')] + Order.PAYMENT_METHOD_CHOICES,
+        widget=forms.Select(attrs={'class': 'form-control'})
+    )
+    registrated_from = forms.DateField(
+        label='Зарегистрирован с', required=False,
+        widget=forms.DateInput(attrs={'class': 'form-control', 'type': 'date'})
+    )
+    registrated_to = forms.DateField(
+        label='по', required=False,
+        widget=forms.DateInput(attrs={'class': 'form-control', 'type': 'date'})
+    )
+    has_restaurant = forms.TypedChoiceField(
+        label='Ресторан', required=False,
+        choices=HAS_RESTAURANT_CHOICES,
+        coerce=lambda value: value == 'yes',
+        empty_value=None,
+        widget=forms.Select(attrs={'class': 'form-control'})
+    )
+    ordering = forms.ChoiceField(
+        label='Сортировка', required=False,
+        choices=ORDERING_CHOICES,
+        widget=forms.Select(attrs={'class': 'form-control'})
+    )
+    cursor = forms.CharField(
+        required=False,
+        widget=forms.HiddenInput()
+    )
+
+
 class LoginView(View):
     def get(self, request, *args, **kwargs):
         form = Login()
@@ -73,27 +137,39 @@ def is_manager(user):
 
 @user_passes_test(is_manager, login_url='restaurateur:login')
 def view_products(request):
-    restaurants = list(Restaurant.objects.order_by('name'))
-    products = list(Product.objects.prefetch_related('menu_items'))
+    availability_matrix = get_availability_matrix()
+    products_with_restaurants = [
+        (
+            product,
+            get_thumbnail_url(product.image, 'small'),
+            get_product_availability(availability_matrix, product.id),
+        )
+        for product in Product.objects.select_related('category')
+    ]
 
-    default_availability = {restaurant.id: False for restaurant in restaurants}
-    products_with_restaurants = []
-    for product in products:
+    page = render_to_string('products_list.html', request=request, context={
+        'restaurant_names': [restaurant_name for restaurant_id, restaurant_name in availability_matrix['restaurants']],
+    })
+    page_head, page_tail = page.split(PRODUCTS_ROWS_PLACEHOLDER)
 
-        availability = {
-            **default_availability,
-            **{item.restaurant_id: item.availability for item in product.menu_items.all()},
-        }
-        orderer_availability = [availability[restaurant.id] for restaurant in restaurants]
+    def render_page():
+        yield page_head
 
-        products_with_restaurants.append(
-            (product, orderer_availability)
-        )
+        rows_template = get_template('products_list_rows.html')
+        for chunk_start in range(0, len(products_with_restaurants), PRODUCTS_ROWS_CHUNK_SIZE):
+            yield rows_template.render({
+                'products_with_restaurants': products_with_restaurants[
+                    chunk_start:chunk_start + PRODUCTS_ROWS_CHUNK_SIZE
+                ],
+            })
 
-    return render(request, template_name="products_list.html", context={
-        'products_with_restaurants': products_with_restaurants,
-        'restaurants': restaurants,
-    })
+        yield page_tail
+
+    if isinstance(request, ASGIRequest):
+        # Django 3.2 iterates streaming responses on the event loop, while this view runs in a worker thread
+        return HttpResponse(''.join(render_page()))
+
+    return StreamingHttpResponse(render_page())
 
 
 @user_passes_test(is_manager, login_url='restaurateur:login')
@@ -105,24 +181,70 @@ def view_restaurants(request):
 
 @user_passes_test(is_manager, login_url='restaurateur:login')
 def view_orders(request):
-    orders = Order.objects.filter(is_processed=False) \
-                          .prefetch_related('order_products', 'order_products__product') \
-                          .count_price()
-
-    restaurant_menu_items = RestaurantMenuItem.objects.filter(availability=True).select_related('product', 'restaurant')
-
-    needed_orders_addresses = [order.address for order in orders]
-    needed_restaurants_addresses = [restaurant_menu_item.restaurant.address for restaurant_menu_item in restaurant_menu_items]
-    needed_addresses = set(needed_orders_addresses + needed_restaurants_addresses)
-
-    not_created_places_addresses = find_not_created_places_for_needed_addresses(needed_addresses)
-    created_places = bulk_create_places_by_addresses(not_created_places_addresses)
+    orders_events_cursor = get_initial_orders_events_cursor()
+    orders_filter = OrdersFilter(request.GET)
+    filter_params = orders_filter.cleaned_data if orders_filter.is_valid() else {}
+
+    orders = filter_orders(
+        Order.objects.filter(is_processed=False),
+        payment_method=filter_params.get('payment_method'),
+        registrated_from=filter_params.get('registrated_from'),
+        registrated_to=filter_params.get('registrated_to'),
+        has_restaurant=filter_params.get('has_restaurant')
+    )
 
-    places = Place.objects.filter(address__in=needed_addresses)
+    ordering = filter_params.get('ordering') or 'registrated_at'
+    try:
+        orders, next_cursor = paginate_orders(orders, ordering, cursor=filter_params.get('cursor'))
+    except ValueError:
+        orders, next_cursor = paginate_orders(orders, ordering)
+
+    next_page_url = None
+    if next_cursor:
+        next_page_params = request.GET.copy()
+        next_page_params['cursor'] = next_cursor
+        next_page_url = f'{request.path}?{next_page_params.urlencode()}'
+
+    # live orders go on top of the page, which only keeps it sorted when the newest orders come first
+    can_insert_new_orders = ordering == '-registrated_at' and not filter_params.get('cursor') and not any(
+        filter_params.get(param) not in (None, '')
+        for param in ['payment_method', 'registrated_from', 'registrated_to', 'has_restaurant']
+    )
 
-    for order in orders:
-        order = append_restaurants_with_distance_to_order(order, places, restaurant_menu_items)
+    first_page_params = request.GET.copy()
+    first_page_params.pop('cursor', None)
 
     return render(request, template_name='order_items.html', context={
         'orders': orders,
+        'orders_filter': orders_filter,
+        'orders_events_url': f'{reverse("restaurateur:orders_events")}?{urlencode({"cursor": orders_events_cursor})}',
+        'next_page_url': next_page_url,
+        'first_page_url': f'{request.path}?{first_page_params.urlencode()}',
+        'is_first_page': not filter_params.get('cursor'),
+        'can_insert_new_orders': can_insert_new_orders,
     })
+
+
+async def view_order_restaurants(request, order_id):
+    if not await sync_to_async(is_manager)(request.user):
+        return redirect_to_login(request.get_full_path(), 'restaurateur:login')
+
+    order_restaurants = await get_order_restaurants_async(order_id)
+    if order_restaurants is None:
+        raise Http404('Заказ не найден')
+
+    return JsonResponse(order_restaurants, json_dumps_params={'ensure_ascii': False})
+
+
+@user_passes_test(is_manager, login_url='restaurateur:login')
+def view_orders_events(request):
+    cursor = parse_orders_events_cursor(request.headers.get('Last-Event-ID'), request.GET.get('cursor'))
+    orders_deltas, cursor = fetch_orders_changes(cursor)
+
+    response = HttpResponse(
+        f'retry: {ORDERS_EVENTS_RETRY_MILLISECONDS}\n\n'.encode() + format_orders_events(orders_deltas, cursor),
+        content_type='text/event-stream; charset=utf-8'
+    )
+    response['Cache-Control'] = 'no-cache'
+
+    return response
@@ -0,0 +1,27 @@
+"""
+ASGI config for Django project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+Requests to the manager's live orders feed are streamed by a native ASGI
+application, everything else is handled by Django.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
+"""
+
+import os
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "star_burger.settings")
+django_application = get_asgi_application()
+
+from restaurateur.events import ORDERS_EVENTS_PATH  # noqa: E402
+from restaurateur.events import orders_events_application  # noqa: E402
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'http' and scope['path'] == ORDERS_EVENTS_PATH:
+        await orders_events_application(scope, receive, send)
+        return
+
+    await django_application(scope, receive, send)
@@ -0,0 +1,52 @@
+import os
+
+
+def get_git_dirs(base_dir):
+    git_dir = os.path.join(base_dir, '.git')
+    if os.path.isfile(git_dir):
+        with open(git_dir) as git_file:
+            git_dir = os.path.join(base_dir, git_file.read().strip()[len('gitdir: '):])
+
+    common_dir = git_dir
+    commondir_path = os.path.join(git_dir, 'commondir')
+    if os.path.isfile(commondir_path):
+        with open(commondir_path) as commondir_file:
+            common_dir = os.path.join(git_dir, commondir_file.read().strip())
+
+    return git_dir, common_dir
+
+
+def read_git_ref(common_dir, ref):
+    try:
+        with open(os.path.join(common_dir, ref)) as ref_file:
+            return ref_file.read().strip()
+    except OSError:
+        pass
+
+    try:
+        with open(os.path.join(common_dir, 'packed-refs')) as packed_refs_file:
+            for line in packed_refs_file:
+                revision, _, packed_ref = line.strip().partition(' ')
+                if packed_ref == ref:
+                    return revision
+    except OSError:
+        pass
+
+    return None
+
+
+def read_git_head(base_dir):
+    try:
+        git_dir, common_dir = get_git_dirs(base_dir)
+        with open(os.path.join(git_dir, 'HEAD')) as head_file:
+            head = head_file.read().strip()
+    except OSError:
+        return None, None
+
+    if not head.startswith('ref: '):
+        return None, head
+
+    ref = head[len('ref: '):]
+    branch = ref[len('refs/heads/'):] if ref.startswith('refs/heads/') else None
+
+    return branch, read_git_ref(common_dir, ref)
@@ -1,15 +1,19 @@
 import os
+from datetime import timedelta
 
 import dj_database_url
 
 from environs import Env
-from git import Repo
+
+from .release import read_git_head
 
 
 env = Env()
 env.read_env()
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+env.read_env(os.path.join(BASE_DIR, 'star_burger', 'release.env'), recurse=False)
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
 
@@ -28,10 +32,10 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
-    'debug_toolbar',
 
     'phonenumber_field',
     'rest_framework',
+    'rest_framework.authtoken',
 ]
 
 MIDDLEWARE = [
@@ -42,11 +46,15 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-
-    'debug_toolbar.middleware.DebugToolbarMiddleware',
-    'rollbar.contrib.django.middleware.RollbarNotifierMiddlewareExcluding404',
 ]
 
+if DEBUG:
+    # the toolbar middleware is sync-only and would make Django run async views in a single thread
+    INSTALLED_APPS.append('debug_toolbar')
+    MIDDLEWARE.append('debug_toolbar.middleware.DebugToolbarMiddleware')
+
+MIDDLEWARE.append('rollbar.contrib.django.middleware.RollbarNotifierMiddlewareExcluding404')
+
 ROOT_URLCONF = 'star_burger.urls'
 
 DEBUG_TOOLBAR_PANELS = [
@@ -89,6 +97,8 @@ MEDIA_URL = '/media/'
 
 DATABASES = {'default': env.dj_db_url("DATABASE_URL")}
 
+CACHES = {'default': env.dj_cache_url('CACHE_URL', 'locmem://')}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -126,12 +136,34 @@ STATICFILES_DIRS = [
     os.path.join(BASE_DIR, "bundles"),
 ]
 
+STATICFILES_STORAGE = 'star_burger.storage.CompressedManifestStaticFilesStorage'
+
 
 YANDEX_GEOCODER_TOKEN = env.str('YANDEX_GEOCODER_TOKEN')
+YANDEX_GEOCODER_URL = env.str('YANDEX_GEOCODER_URL', 'https://geocode-maps.yandex.ru/1.x')
+YANDEX_GEOCODER_TIMEOUT = env.float('YANDEX_GEOCODER_TIMEOUT', 5)
+YANDEX_GEOCODER_MAX_WORKERS = env.int('YANDEX_GEOCODER_MAX_WORKERS', 8)
+YANDEX_GEOCODER_RATE_LIMIT = env.float('YANDEX_GEOCODER_RATE_LIMIT', 10)
+GEOCODER_PLACE_TTL = timedelta(days=env.int('GEOCODER_PLACE_TTL_DAYS', 30))
+GEOCODER_NOT_FOUND_PLACE_TTL = timedelta(hours=env.int('GEOCODER_NOT_FOUND_PLACE_TTL_HOURS', 24))
+
+IDEMPOTENCY_KEY_TTL = timedelta(hours=env.int('IDEMPOTENCY_KEY_TTL_HOURS', 24))
+BULK_ORDERS_MAX_COUNT = env.int('BULK_ORDERS_MAX_COUNT', 5000)
+
+DISTANCE_ACCURACY = env.str('DISTANCE_ACCURACY', 'haversine')
+GEODESIC_TOP_K = env.int('GEODESIC_TOP_K', 3)
+ORDER_RESTAURANTS_LIMIT = env.int('ORDER_RESTAURANTS_LIMIT', 10)
+ORDER_RESTAURANTS_RADIUS_KM = env.float('ORDER_RESTAURANTS_RADIUS_KM', 50)
+
+GIT_REVISION = env.str('GIT_REVISION', None)
+GIT_BRANCH = env.str('GIT_BRANCH', None)
+if not GIT_REVISION:
+    GIT_BRANCH, GIT_REVISION = read_git_head(BASE_DIR)
 
 ROLLBAR = {
     'access_token': env('ROLLBAR_POST_SERVER_ITEM_ACCESS_TOKEN', 'YOUR_ROLLBAR_POST_SERVER_ITEM_ACCESS_TOKEN'),
     'environment': env('ROLLBAR_ENVIRONMENT_NAME', 'development'),
-    'branch': Repo(path=BASE_DIR).active_branch.name,
+    'branch': GIT_BRANCH,
+    'code_version': GIT_REVISION,
     'root': BASE_DIR,
 }
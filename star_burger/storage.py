@@ -0,0 +1,60 @@
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.map', '.json', '.svg', '.txt', '.html', '.xml', '.ico')
+COMPRESSION_MIN_SIZE = 1024
+
+
+def compress_gzip(content):
+    return gzip.compress(content, compresslevel=9, mtime=0)
+
+
+def compress_brotli(content):
+    return brotli.compress(content, quality=11)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    def get_compressors(self):
+        compressors = {'.gz': compress_gzip}
+        if brotli:
+            compressors['.br'] = compress_brotli
+        return compressors
+
+    def compress_file(self, name):
+        with self.open(name) as static_file:
+            content = static_file.read()
+        if len(content) < COMPRESSION_MIN_SIZE:
+            return
+
+        for extension, compress in self.get_compressors().items():
+            compressed_content = compress(content)
+            if len(compressed_content) >= len(content):
+                continue
+
+            compressed_name = f'{name}{extension}'
+            if self.exists(compressed_name):
+                self.delete(compressed_name)
+            self._save(compressed_name, ContentFile(compressed_content))
+
+    def post_process(self, paths, dry_run=False, **options):
+        hashed_names = {}
+        for name, hashed_name, processed in super().post_process(paths, dry_run, **options):
+            yield name, hashed_name, processed
+            if hashed_name and not isinstance(processed, Exception):
+                hashed_names[name] = hashed_name
+
+        if dry_run:
+            return
+
+        for name, hashed_name in hashed_names.items():
+            if name.endswith(COMPRESSIBLE_EXTENSIONS):
+                self.compress_file(name)
+                self.compress_file(hashed_name)